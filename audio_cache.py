@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+"""
+合成済み音声データをメモリ上・ディスク上に保持するキャッシュモジュール
+"""
+
+import os
+import queue
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+
+class CacheInfo(NamedTuple):
+    """キャッシュの統計情報"""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class AudioCache:
+    """
+    スレッドセーフな音声データのキャッシュ
+
+    破棄の方式は以下のいずれかを選択できる。
+        - "lru": 最も長く使われていないものから破棄する
+        - "fifo": 最も古く保存されたものから破棄する（取得時に順序を更新しない）
+    """
+
+    def __init__(self, maxsize: int = 256, policy: str = "lru", max_bytes: Optional[int] = None):
+        """
+        AudioCacheの初期化
+
+        Args:
+            maxsize (int, optional): 保持する音声データの最大件数。デフォルトは256。
+            policy (str, optional): 破棄の方式 ("lru" または "fifo")。デフォルトは "lru"。
+            max_bytes (Optional[int], optional): 保持する音声データの合計の最大バイト数。Noneの場合は制限しない。
+
+        Raises:
+            ValueError: 破棄の方式が不正な場合
+        """
+        if policy not in ("lru", "fifo"):
+            raise ValueError(f"不正なキャッシュの破棄方式です: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.max_bytes = max_bytes
+        self._total_bytes = 0
+        self._data: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        # 合成中のキーと、その結果を待つためのFuture
+        self._inflight: Dict[Hashable, "Future[bytes]"] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """
+        キャッシュから音声データを取得する
+
+        Args:
+            key (Hashable): キャッシュのキー
+
+        Returns:
+            Optional[bytes]: 音声データ。キャッシュにない場合はNone。
+        """
+        # FIFOでは取得時に順序を更新しないため、ロックを取らずに辞書を参照するだけでよい
+        if self.policy == "fifo":
+            data = self._data.get(key)
+        else:
+            with self._lock:
+                data = self._data.get(key)
+                if data is not None:
+                    self._data.move_to_end(key)
+
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return data
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], bytes]) -> bytes:
+        """
+        キャッシュから音声データを取得し、なければ合成してキャッシュに保存する
+
+        同じキーの合成が他のスレッドで実行中の場合は、重複して合成せずにその結果を待つ。
+        合成で例外が発生した場合は、待っていたスレッドにも同じ例外を送出し、キャッシュしない。
+
+        Args:
+            key (Hashable): キャッシュのキー
+            compute (Callable[[], bytes]): 音声データを合成する関数
+
+        Returns:
+            bytes: 音声データ
+        """
+        data = self.get(key)
+        if data is not None:
+            return data
+
+        with self._lock:
+            # 取得してからロックを取るまでの間に他のスレッドが保存した場合
+            data = self._data.get(key)
+            if data is not None:
+                return data
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not is_owner:
+            return future.result()
+
+        try:
+            data = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        self.put(key, data)
+        with self._lock:
+            del self._inflight[key]
+        future.set_result(data)
+        return data
+
+    def put(self, key: Hashable, data: bytes) -> None:
+        """
+        音声データをキャッシュに保存する
+
+        最大件数または最大バイト数を超えた場合は、破棄の方式に従って古いものから破棄する。
+        最大バイト数を超える音声データは保存しない。
+
+        Args:
+            key (Hashable): キャッシュのキー
+            data (bytes): 音声データ
+        """
+        size = len(data)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._data.get(key)
+            if old is not None:
+                self._total_bytes -= len(old)
+            self._data[key] = data
+            self._total_bytes += size
+            if self.policy == "lru":
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize or (
+                    self.max_bytes is not None and self._total_bytes > self.max_bytes):
+                _, evicted = self._data.popitem(last=False)
+                self._total_bytes -= len(evicted)
+
+    def clear(self) -> None:
+        """キャッシュを消去する"""
+        with self._lock:
+            self._data.clear()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        """
+        キャッシュの統計情報を取得する
+
+        Returns:
+            CacheInfo: ヒット数・ミス数・最大件数・現在の件数
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def __len__(self) -> int:
+        """キャッシュされている音声データの件数を返す"""
+        return len(self._data)
+
+
+class DiskCache:
+    """
+    合成済み音声データをファイルとして保存するキャッシュ
+
+    ファイルはキーのハッシュ値をファイル名として、先頭2文字のサブディレクトリに保存する。
+    書き込みはバックグラウンドのスレッドで行い、ファイル数が上限を超えた場合は
+    最後に使われた日時が古いものから削除する。
+    """
+
+    # 何回書き込むごとにファイル数の上限を確認するか
+    PRUNE_INTERVAL = 100
+
+    def __init__(self, directory: str, suffix: str, max_entries: int = 2000):
+        """
+        DiskCacheの初期化
+
+        Args:
+            directory (str): キャッシュを保存するディレクトリ
+            suffix (str): キャッシュファイルの拡張子 (例: ".mp3")
+            max_entries (int, optional): 保持するファイルの最大数。デフォルトは2000。
+        """
+        self.directory = directory
+        self.suffix = suffix
+        self.max_entries = max_entries
+        self._write_queue: "queue.Queue[Tuple[str, bytes]]" = queue.Queue()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._write_count = 0
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """
+        文字列の組からキャッシュのキーを作成する
+
+        各要素はNUL文字で区切るため、最後の要素以外はNUL文字を含まないこと。
+
+        Args:
+            *parts (str): キーを構成する文字列
+
+        Returns:
+            str: 16バイトのBLAKE2bハッシュ値の16進文字列
+        """
+        return hashlib.blake2b("\0".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+    def _path(self, key: str) -> str:
+        """
+        キーに対応するファイルパスを取得する
+
+        Args:
+            key (str): make_keyで作成したキー
+
+        Returns:
+            str: キャッシュファイルのパス
+        """
+        return os.path.join(self.directory, key[:2], key + self.suffix)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        キャッシュから音声データを読み込む
+
+        Args:
+            key (str): make_keyで作成したキー
+
+        Returns:
+            Optional[bytes]: 音声データ。キャッシュがない場合はNone。
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # 削除対象を決めるため、最後に使われた日時として更新日時を更新する
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"音声キャッシュの読み込み中にエラーが発生しました: {e}")
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        音声データのキャッシュへの書き込みをバックグラウンドスレッドに依頼する
+
+        合成結果を返すまでにファイル書き込みを待たないようにするため、
+        書き込み用のスレッドを初回呼び出し時に起動して処理させる。
+
+        Args:
+            key (str): make_keyで作成したキー
+            data (bytes): 音声データ
+        """
+        with self._writer_lock:
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+                self._writer_thread.start()
+        self._write_queue.put((self._path(key), data))
+
+    def join(self) -> None:
+        """依頼済みの書き込みがすべて完了するまで待機する"""
+        self._write_queue.join()
+
+    def _writer_loop(self) -> None:
+        """
+        キューに積まれた音声データを順にファイルへ書き込む
+
+        1回の起動で書き込む件数がPRUNE_INTERVALに満たなくても上限を守れるように、
+        起動時にも一度ファイル数の上限を確認する。
+        """
+        self.prune()
+        while True:
+            path, data = self._write_queue.get()
+            try:
+                self._write(path, data)
+                self._write_count += 1
+                if self._write_count % self.PRUNE_INTERVAL == 0:
+                    self.prune()
+            finally:
+                self._write_queue.task_done()
+
+    def _write(self, path: str, data: bytes) -> None:
+        """
+        音声データをファイルに保存する
+
+        書き込み途中のファイルが読まれないように、一時ファイルに書き込んでから置き換える。
+
+        Args:
+            path (str): キャッシュファイルのパス
+            data (bytes): 音声データ
+        """
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except OSError as e:
+            print(f"音声キャッシュの保存中にエラーが発生しました: {e}")
+
+    def prune(self) -> None:
+        """ファイル数が上限を超えている場合、最後に使われた日時が古いものから削除する"""
+        entries = []
+        try:
+            with os.scandir(self.directory) as subdirs:
+                for subdir in subdirs:
+                    if not subdir.is_dir():
+                        continue
+                    with os.scandir(subdir.path) as files:
+                        for entry in files:
+                            if entry.name.endswith(self.suffix):
+                                entries.append((entry.stat().st_mtime, entry.path))
+        except OSError as e:
+            print(f"音声キャッシュの整理中にエラーが発生しました: {e}")
+            return
+
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -5,15 +5,122 @@
 音声データを特定のスピーカーデバイスで再生する共通モジュール
 """
 
-import io
-import wave
+import atexit
 import pyaudiowpatch as pyaudio
 import threading
-from typing import Optional, Dict, Union, List
+from typing import Any, Optional, Dict, Union, List, Tuple
+
+from tts_utils import parse_wav, resample_pcm16
+
+# プロセス全体で共有するPyAudioインスタンス（初期化時にすべてのデバイスを列挙するため、一度だけ作成する）
+_pa: Optional[pyaudio.PyAudio] = None
+_pa_lock = threading.Lock()
+
+
+def _get_pyaudio() -> pyaudio.PyAudio:
+    """
+    共有のPyAudioインスタンスを取得する
+
+    Returns:
+        pyaudio.PyAudio: 初回呼び出し時に作成したPyAudioインスタンス
+    """
+    global _pa
+    with _pa_lock:
+        if _pa is None:
+            _pa = pyaudio.PyAudio()
+            atexit.register(_pa.terminate)
+        return _pa
+
+
+class _PlaybackBuffer:
+    """
+    出力ストリームのコールバックに渡すPCMサンプルを保持するバッファ
+
+    PortAudioのスレッドがreadで先頭から順に取り出す。
+    """
+
+    __slots__ = ("_samples", "_position", "_lock", "drained")
+
+    def __init__(self, samples: bytes) -> None:
+        """
+        _PlaybackBufferの初期化
+
+        Args:
+            samples (bytes): 再生するPCMサンプル（bytes-likeオブジェクト）
+        """
+        view = memoryview(samples).cast("B")
+        if not view.readonly:
+            view = memoryview(bytes(view))
+        self._samples = view
+        self._position = 0
+        self._lock = threading.Lock()
+        # すべてのPCMサンプルを取り出し終えたか、取り消された時にセットされる
+        self.drained = threading.Event()
+        if not view:
+            self.drained.set()
+
+    def cancel(self) -> None:
+        """残りのPCMサンプルを破棄して再生を終える"""
+        with self._lock:
+            self._position = len(self._samples)
+            self.drained.set()
+
+    def read(self, nbytes: int) -> Tuple[memoryview, bool]:
+        """
+        PCMサンプルを先頭から取り出す
+
+        取り出したPCMサンプルはコピーせずにmemoryviewで返す。
+
+        Args:
+            nbytes (int): 取り出すバイト数（フレームの整数倍）
+
+        Returns:
+            Tuple[memoryview, bool]: PCMサンプルと、これで最後かどうか
+        """
+        with self._lock:
+            start = self._position
+            end = min(start + nbytes, len(self._samples))
+            self._position = end
+            complete = end >= len(self._samples)
+            if complete:
+                self.drained.set()
+            return self._samples[start:end], complete
+
+
+class _StreamCallback:
+    """
+    使い回す出力ストリームのコールバック
+
+    ストリームを開き直さずに済むように、再生ごとにbufferを差し替えて使う。
+    """
+
+    __slots__ = ("buffer", "frame_size")
+
+    def __init__(self, frame_size: int) -> None:
+        """
+        _StreamCallbackの初期化
+
+        Args:
+            frame_size (int): 1フレームのバイト数（サンプル幅 × チャンネル数）
+        """
+        self.buffer: Optional[_PlaybackBuffer] = None
+        self.frame_size = frame_size
+
+    def __call__(self, in_data: Optional[bytes], frame_count: int, time_info: Dict[str, float], status: int) -> Tuple[Any, int]:
+        """PortAudioのスレッドから呼ばれ、次に再生するPCMサンプルを返す"""
+        buffer = self.buffer
+        if buffer is None:
+            return b"", pyaudio.paComplete
+        data, complete = buffer.read(frame_count * self.frame_size)
+        return data, pyaudio.paComplete if complete else pyaudio.paContinue
+
 
 class AudioPlayer:
     """音声データを特定のスピーカーデバイスで再生するクラス"""
 
+    # 開いたまま使い回すストリームの最大数（形式・デバイスの組み合わせごとに1つ）
+    MAX_CACHED_STREAMS = 4
+
     def __init__(self, output_device_index: Optional[int] = None, output_device_index_2: Optional[int] = None, speaker_2_enabled: bool = False):
         """
         AudioPlayerの初期化
@@ -30,16 +137,173 @@ class AudioPlayer:
         self.output_device_index = output_device_index
         self.output_device_index_2 = output_device_index_2
         self.speaker_2_enabled = speaker_2_enabled
-        self.p = pyaudio.PyAudio()
+        self.p = _get_pyaudio()
         self.stop_requested: bool = False
         self.current_stream_1: Optional[pyaudio.Stream] = None
         self.current_stream_2: Optional[pyaudio.Stream] = None
         self._stream_lock = threading.Lock()
+        # (サンプル幅, チャンネル数, サンプルレート, デバイスインデックス) ごとに開いたままのストリームとそのコールバック
+        self._stream_cache: Dict[Tuple[int, int, int, Optional[int]], Tuple[pyaudio.Stream, _StreamCallback]] = {}
+        # 再生中のストリームに渡しているバッファ
+        self._current_buffers: List[_PlaybackBuffer] = []
+        # (サンプル幅, チャンネル数, サンプルレート, デバイスインデックス) ごとの出力に使うサンプルレート
+        self._output_rates: Dict[Tuple[int, int, int, Optional[int]], int] = {}
 
     def __del__(self) -> None:
         """クリーンアップ処理"""
-        if hasattr(self, 'p') and self.p:
-            self.p.terminate()
+        for stream, _ in getattr(self, '_stream_cache', {}).values():
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def _output_rate(self, width: int, channels: int, rate: int, device_index: Optional[int]) -> int:
+        """
+        指定された形式の音声をデバイスに出力する際のサンプルレートを取得する
+
+        デバイスがそのままのサンプルレートに対応していない場合は、デバイスの既定のサンプルレートを返す。
+        サンプルレートの変換は16bit PCMのみ対応しているため、それ以外はそのままのサンプルレートを返す。
+
+        Args:
+            width (int): サンプル幅（バイト数）
+            channels (int): チャンネル数
+            rate (int): 音声データのサンプルレート
+            device_index (Optional[int]): 出力デバイスのインデックス
+
+        Returns:
+            int: 出力に使うサンプルレート
+        """
+        key = (width, channels, rate, device_index)
+        output_rate = self._output_rates.get(key)
+        if output_rate is not None:
+            return output_rate
+
+        output_rate = rate
+        if width == 2:
+            try:
+                if device_index is None:
+                    device_info = self.p.get_default_output_device_info()
+                else:
+                    device_info = self.p.get_device_info_by_index(device_index)
+                try:
+                    self.p.is_format_supported(
+                        rate,
+                        output_device=device_info['index'],
+                        output_channels=channels,
+                        output_format=self.p.get_format_from_width(width)
+                    )
+                except ValueError:
+                    output_rate = int(device_info['defaultSampleRate'])
+            except Exception as e:
+                print(f"出力デバイスのサンプルレートの確認中にエラーが発生しました: {e}")
+        self._output_rates[key] = output_rate
+        return output_rate
+
+    def _open_stream(
+        self, width: int, channels: int, rate: int, device_index: Optional[int]
+    ) -> Tuple[pyaudio.Stream, _StreamCallback]:
+        """
+        指定された形式・デバイスの出力ストリームを、開始せずに取得する
+
+        ストリームを開く処理は時間がかかるため、一度開いたストリームは閉じずに使い回す。
+        開いたままのストリームが上限を超えた場合は、最も古く開いたものを閉じる。
+
+        Args:
+            width (int): サンプル幅（バイト数）
+            channels (int): チャンネル数
+            rate (int): サンプルレート
+            device_index (Optional[int]): 出力デバイスのインデックス
+
+        Returns:
+            Tuple[pyaudio.Stream, _StreamCallback]: 出力ストリームとそのコールバック
+        """
+        key = (width, channels, rate, device_index)
+        entry = self._stream_cache.pop(key, None)
+        if entry is None:
+            if len(self._stream_cache) >= self.MAX_CACHED_STREAMS:
+                oldest = next(iter(self._stream_cache))
+                self._close_cached_stream(oldest)
+            callback = _StreamCallback(width * channels)
+            stream = self.p.open(
+                format=self.p.get_format_from_width(width),
+                channels=channels,
+                rate=rate,
+                output=True,
+                output_device_index=device_index,
+                start=False,
+                stream_callback=callback
+            )
+            entry = (stream, callback)
+        # 最近使ったものを後ろに置き、古いものから閉じる
+        self._stream_cache[key] = entry
+        return entry
+
+    def prime(self, rate: int = 24000, channels: int = 1, width: int = 2) -> None:
+        """
+        指定された形式の出力ストリームを、使用するデバイスごとに事前に開いておく
+
+        最初の再生でストリームを開く時間を待たないようにする。開いたストリームは開始せず、再生時に開始する。
+        デフォルトの形式はVOICEVOXの出力形式 (24kHz・モノラル・16bit)。
+
+        Args:
+            rate (int, optional): サンプルレート。デフォルトは24000。
+            channels (int, optional): チャンネル数。デフォルトは1。
+            width (int, optional): サンプル幅（バイト数）。デフォルトは2。
+        """
+        devices = [self.output_device_index]
+        if self.speaker_2_enabled and self.output_device_index_2 is not None:
+            devices.append(self.output_device_index_2)
+        with self._stream_lock:
+            for device_index in devices:
+                try:
+                    self._open_stream(width, channels, self._output_rate(width, channels, rate, device_index), device_index)
+                except Exception as e:
+                    print(f"出力ストリームを開く際にエラーが発生しました: {e}")
+
+    def _start_stream(
+        self, width: int, channels: int, rate: int, device_index: Optional[int], buffer: _PlaybackBuffer
+    ) -> pyaudio.Stream:
+        """
+        指定された形式・デバイスの出力ストリームで、バッファの再生を開始する
+
+        ストリームはコールバックモードで開き、PortAudioのスレッドがバッファからPCMサンプルを取り出す。
+
+        Args:
+            width (int): サンプル幅（バイト数）
+            channels (int): チャンネル数
+            rate (int): サンプルレート
+            device_index (Optional[int]): 出力デバイスのインデックス
+            buffer (_PlaybackBuffer): 再生するPCMサンプルのバッファ
+
+        Returns:
+            pyaudio.Stream: 再生を開始した出力ストリーム
+        """
+        key = (width, channels, rate, device_index)
+        stream, callback = self._open_stream(width, channels, rate, device_index)
+        # 前回の再生をコールバックが終えたストリームは、停止してからでないと開始できない
+        if not stream.is_stopped():
+            stream.stop_stream()
+        callback.buffer = buffer
+        try:
+            stream.start_stream()
+        except Exception:
+            self._close_cached_stream(key)
+            raise
+        return stream
+
+    def _close_cached_stream(self, key: Tuple[int, int, int, Optional[int]]) -> None:
+        """
+        使い回しているストリームを閉じてキャッシュから取り除く
+
+        Args:
+            key (Tuple[int, int, int, Optional[int]]): ストリームのキー
+        """
+        entry = self._stream_cache.pop(key, None)
+        if entry is not None:
+            try:
+                entry[0].close()
+            except Exception:
+                pass
 
     @staticmethod
     def list_audio_devices() -> List[Dict[str, Union[int, str, float]]]:
@@ -49,49 +313,46 @@ class AudioPlayer:
         Returns:
             List[Dict[str, Union[int, str, float]]]: デバイス情報のリスト
         """
-        p = pyaudio.PyAudio()
+        p = _get_pyaudio()
         devices: List[Dict[str, Union[int, str, float]]] = []
 
-        try:
-            for i in range(p.get_device_count()):
-                device_info = p.get_device_info_by_index(i)
-                if device_info['maxOutputChannels'] > 0:
-                    device_name = device_info['name']
-                    if isinstance(device_name, str):
-                        try:
-                            if all(ord(c) >= 32 and ord(c) <= 126 or ord(c) >= 160 for c in device_name):
-                                fixed_name = device_name
-                            else:
+        for i in range(p.get_device_count()):
+            device_info = p.get_device_info_by_index(i)
+            if device_info['maxOutputChannels'] > 0:
+                device_name = device_info['name']
+                if isinstance(device_name, str):
+                    try:
+                        if all(ord(c) >= 32 and ord(c) <= 126 or ord(c) >= 160 for c in device_name):
+                            fixed_name = device_name
+                        else:
+                            try:
+                                device_bytes = device_name.encode('latin1')
+                                fixed_name = device_bytes.decode('cp932', errors='replace')
+                            except (UnicodeDecodeError, UnicodeEncodeError):
                                 try:
                                     device_bytes = device_name.encode('latin1')
-                                    fixed_name = device_bytes.decode('cp932', errors='replace')
+                                    fixed_name = device_bytes.decode('utf-8', errors='replace')
                                 except (UnicodeDecodeError, UnicodeEncodeError):
-                                    try:
-                                        device_bytes = device_name.encode('latin1')
-                                        fixed_name = device_bytes.decode('utf-8', errors='replace')
-                                    except (UnicodeDecodeError, UnicodeEncodeError):
-                                        fixed_name = ''.join(c if ord(c) >= 32 and ord(c) <= 126 or ord(c) >= 160 else '?' for c in device_name)
-                                        if not fixed_name.strip():
-                                            fixed_name = f"Audio Device {i}"
-                        except Exception:
-                            fixed_name = f"Audio Device {i}"
-                    else:
-                        fixed_name = str(device_name)
-                    
-                    host_api_index = device_info['hostApi']
-                    host_info = p.get_host_api_info_by_index(host_api_index)
-                    host_name = host_info['name']
-
-                    devices.append({
-                        'index': i,
-                        'name': fixed_name,
-                        'channels': device_info['maxOutputChannels'],
-                        'sample_rate': int(device_info['defaultSampleRate']),
-                        'host_api_index': host_api_index,
-                        'host_name': host_name
-                    })
-        finally:
-            p.terminate()
+                                    fixed_name = ''.join(c if ord(c) >= 32 and ord(c) <= 126 or ord(c) >= 160 else '?' for c in device_name)
+                                    if not fixed_name.strip():
+                                        fixed_name = f"Audio Device {i}"
+                    except Exception:
+                        fixed_name = f"Audio Device {i}"
+                else:
+                    fixed_name = str(device_name)
+                
+                host_api_index = device_info['hostApi']
+                host_info = p.get_host_api_info_by_index(host_api_index)
+                host_name = host_info['name']
+
+                devices.append({
+                    'index': i,
+                    'name': fixed_name,
+                    'channels': device_info['maxOutputChannels'],
+                    'sample_rate': int(device_info['defaultSampleRate']),
+                    'host_api_index': host_api_index,
+                    'host_name': host_name
+                })
 
         return devices
 
@@ -108,71 +369,93 @@ class AudioPlayer:
             self.current_stream_1 = None
             self.current_stream_2 = None
 
-        with io.BytesIO(audio_data) as f:
-            with wave.open(f, 'rb') as wf:
-                channels = wf.getnchannels()
-                width = wf.getsampwidth()
-                rate = wf.getframerate()
+        channels, width, rate, samples = parse_wav(audio_data)
+        frame_size = width * channels
+        samples = samples[:len(samples) - len(samples) % frame_size]
+        if samples:
+            self._play_pcm(width, channels, rate, samples, wait)
+
+    def _play_pcm(self, width: int, channels: int, rate: int, samples: memoryview, wait: bool) -> None:
+        """
+        PCMサンプルを出力デバイスで再生する
+
+        PCMサンプルはバッファに渡すだけで、デバイスへの書き込みはPortAudioのスレッドが行う。
+        2番目のデバイスにも専用のバッファを用意するため、2つのデバイスへの出力は並行して進む。
+        デバイスが対応していないサンプルレートの場合は、デバイスの既定のサンプルレートに変換して再生する。
+
+        Args:
+            width (int): サンプル幅（バイト数）
+            channels (int): チャンネル数
+            rate (int): サンプルレート
+            samples (memoryview): フレームの整数倍のバイト数のPCMサンプル
+            wait (bool): 再生が終了するまで待機するかどうか
+        """
+        use_speaker_2 = self.speaker_2_enabled and self.output_device_index_2 is not None
+        devices = [self.output_device_index, self.output_device_index_2] if use_speaker_2 else [self.output_device_index]
+        rates = [self._output_rate(width, channels, rate, device) for device in devices]
+        # 同じサンプルレートのデバイスには、音声全体を一度だけ変換したデータを渡す
+        converted = {rate: samples}
+        for output_rate in rates:
+            if output_rate not in converted:
+                converted[output_rate] = resample_pcm16(samples, channels, rate, output_rate)
+        buffers = [_PlaybackBuffer(converted[output_rate]) for output_rate in rates]
 
+        streams: List[pyaudio.Stream] = []
+        with self._stream_lock:
+            if self.stop_requested:
+                return
+
+            try:
+                self.current_stream_1 = self._start_stream(width, channels, rates[0], devices[0], buffers[0])
+                streams.append(self.current_stream_1)
+                if use_speaker_2:
+                    self.current_stream_2 = self._start_stream(width, channels, rates[1], devices[1], buffers[1])
+                    streams.append(self.current_stream_2)
+            except Exception:
+                for buffer in buffers:
+                    buffer.cancel()
+                self.current_stream_1 = None
+                self.current_stream_2 = None
+                raise
+            self._current_buffers = buffers
+
+        try:
+            # バッファを取り出し終えるまで待つ（ストリームが異常終了した場合は待たない）
+            for buffer, stream in zip(buffers, streams):
+                while not buffer.drained.wait(0.1):
+                    if not stream.is_active():
+                        break
+
+            if wait and not self.stop_requested:
                 with self._stream_lock:
-                    if self.stop_requested:
-                        return
-
-                    self.current_stream_1 = self.p.open(
-                        format=self.p.get_format_from_width(width),
-                        channels=channels,
-                        rate=rate,
-                        output=True,
-                        output_device_index=self.output_device_index
-                    )
-                    if self.speaker_2_enabled and self.output_device_index_2 is not None:
-                        self.current_stream_2 = self.p.open(
-                            format=self.p.get_format_from_width(width),
-                            channels=channels,
-                            rate=rate,
-                            output=True,
-                            output_device_index=self.output_device_index_2
-                        )
-
-                chunk_size = 1024
-                data = wf.readframes(chunk_size)
+                    for stream in streams:
+                        stream.stop_stream()
+        except Exception:
+            # エラーが発生したストリームは使い回さずに閉じる
+            with self._stream_lock:
+                for buffer in buffers:
+                    buffer.cancel()
+                self._close_current_streams()
+            raise
+        finally:
+            # ストリームは次の再生で使い回すため、閉じずに参照だけを外す
+            with self._stream_lock:
+                self.current_stream_1 = None
+                self.current_stream_2 = None
+                self._current_buffers = []
 
-                try:
-                    while len(data) > 0:
-                        with self._stream_lock:
-                            if self.stop_requested:
-                                break
-                            if self.current_stream_1:
-                                self.current_stream_1.write(data)
-                            if self.current_stream_2:
-                                self.current_stream_2.write(data)
-                        data = wf.readframes(chunk_size)
-
-                    if wait and not self.stop_requested:
-                        with self._stream_lock:
-                            if self.current_stream_1:
-                                self.current_stream_1.stop_stream()
-                            if self.current_stream_2:
-                                self.current_stream_2.stop_stream()
-                finally:
-                    with self._stream_lock:
-                        if self.current_stream_1:
-                            try:
-                                self.current_stream_1.close()
-                            except Exception:
-                                pass
-                        if self.current_stream_2:
-                            try:
-                                self.current_stream_2.close()
-                            except Exception:
-                                pass
-                        self.current_stream_1 = None
-                        self.current_stream_2 = None
+    def _close_current_streams(self) -> None:
+        """再生中のストリームを閉じてキャッシュから取り除く（_stream_lockを取得して呼ぶこと）"""
+        for key, (stream, _) in list(self._stream_cache.items()):
+            if stream is self.current_stream_1 or stream is self.current_stream_2:
+                self._close_cached_stream(key)
 
     def request_stop(self) -> None:
         """再生の停止をリクエストする"""
         with self._stream_lock:
             self.stop_requested = True
+            for buffer in self._current_buffers:
+                buffer.cancel()
             try:
                 if self.current_stream_1 and self.current_stream_1.is_active():
                     self.current_stream_1.stop_stream()
@@ -184,3 +467,32 @@ class AudioPlayer:
                     self.current_stream_2.stop_stream()
             except Exception:
                 pass
+
+
+class BaseSpeaker:
+    """AudioPlayerで音声を再生する話者クラスの共通基底クラス"""
+
+    __slots__ = ("player",)
+
+    def __init__(self, player: AudioPlayer):
+        """
+        BaseSpeakerの初期化
+
+        Args:
+            player (AudioPlayer): オーディオ再生を処理するAudioPlayerインスタンス
+        """
+        self.player = player
+
+    def play_bytes(self, audio_data: bytes, wait: bool = True) -> None:
+        """
+        WAV形式のバイトデータを再生する
+
+        Args:
+            audio_data (bytes): 再生するWAV形式の音声データ
+            wait (bool, optional): 再生が終了するまで待機するかどうか。デフォルトはTrue。
+        """
+        self.player.play_wav_bytes(audio_data, wait=wait)
+
+    def request_stop(self) -> None:
+        """再生の停止をリクエストする"""
+        self.player.request_stop()
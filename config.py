@@ -1,12 +1,14 @@
 import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 
 class Config:
     """設定の管理クラス"""
 
     CONFIG_FILE = "config.json"
+    # 読み込み・保存した設定のキャッシュ（get/set/updateのたびにファイルを読み直さない）
+    _cache: Optional[Dict[str, Any]] = None
 
     @staticmethod
     def load() -> Dict[str, Any]:
@@ -16,12 +18,15 @@ class Config:
         Returns:
             Dict[str, Any]: 設定の辞書
         """
-        if not os.path.exists(Config.CONFIG_FILE):
-            return {}
+        if Config._cache is not None:
+            return dict(Config._cache)
 
         try:
             with open(Config.CONFIG_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
+                Config._cache = json.load(f)
+            return dict(Config._cache)
+        except FileNotFoundError:
+            return {}
         except Exception as e:
             print(f"設定の読み込み中にエラーが発生しました: {e}")
             return {}
@@ -34,12 +39,20 @@ class Config:
         Args:
             config_data (Dict[str, Any]): 保存する設定の辞書
         """
+        # 書き込み途中で終了しても設定ファイルが壊れないように、一時ファイルに書き込んでから置き換える
+        tmp_file = f"{Config.CONFIG_FILE}.tmp"
         try:
-            with open(Config.CONFIG_FILE, "w", encoding="utf-8") as f:
+            with open(tmp_file, "w", encoding="utf-8") as f:
                 json.dump(config_data, f, ensure_ascii=False, indent=2)
-            print(f"設定を {Config.CONFIG_FILE} に保存しました")
+            os.replace(tmp_file, Config.CONFIG_FILE)
+            Config._cache = dict(config_data)
         except Exception as e:
             print(f"設定の保存中にエラーが発生しました: {e}")
+            # 置き換えられなかった一時ファイルを残さない
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
 
     @staticmethod
     def get(key: str, default: Any = None) -> Any:
@@ -5,26 +5,340 @@
 gTTSで生成した音声を特定のスピーカーデバイスで再生するモジュール
 """
 
-import io
-import wave
+import re
+import sys
+import base64
+import hashlib
+import functools
+import threading
+import urllib.request
 import miniaudio
-from typing import Optional, Dict
-from gtts import gTTS, lang
-from audio_player import AudioPlayer
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, FrozenSet, Iterator, Optional, Dict, List, Tuple, Union
+from gtts import gTTS, gTTSError, lang
+from gtts.utils import _translate_url
+from audio_player import AudioPlayer, BaseSpeaker
+from audio_cache import AudioCache, CacheInfo, DiskCache
+from tts_utils import build_wav, synthesize_sentences
+from vrct_languages import vrct_lang_dict
 
-class gTTSSpeaker:
+# gTTSのリクエストで共有するHTTPセッション（TCP/TLS接続を使い回す）
+# 接続の確立に失敗した場合のみ再試行する（送信済みのリクエストは再送しない）
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2),
+)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
+# gTTSと同様にプロキシ・ファイアウォール環境向けにSSL検証を無効にするため、警告を抑制する
+requests.packages.urllib3.disable_warnings(requests.packages.urllib3.exceptions.InsecureRequestWarning)
+
+# 同時に送信するgTTSのリクエストの最大数（文ごと・項目ごとの並列化が重なっても、
+# Google翻訳へのリクエストがこの数を超えないようにする）
+_MAX_INFLIGHT_REQUESTS = 4
+_request_slots = threading.BoundedSemaphore(_MAX_INFLIGHT_REQUESTS)
+
+# 分割されたテキストのリクエストを並列に送信するスレッドプール（呼び出しごとに作成しない）
+# このプールのタスクは他のプールにタスクを投入しないため、入れ子の呼び出しでもデッドロックしない
+_part_executor = ThreadPoolExecutor(max_workers=_MAX_INFLIGHT_REQUESTS, thread_name_prefix="gtts-part")
+
+# synthesize_manyで複数のテキストを並列に合成するスレッドプール
+_batch_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="gtts-batch")
+
+# レスポンスから音声データ(base64)を取り出す正規表現
+_AUDIO_RE = re.compile(r'jQ1olc","\[\\"(.*)\\"]')
+
+# 合成済みMP3を保存するディスクキャッシュ（Noneの場合はディスクキャッシュを使用しない）
+_disk_cache: Optional[DiskCache] = None
+
+# 合成済みMP3を (textのハッシュ値, lang, tld) をキーにメモリ上に保持する
+_mp3_cache = AudioCache(maxsize=256, max_bytes=32 * 1024 * 1024)
+
+
+class _SessionGTTS(gTTS):
+    """共有HTTPセッションでリクエストを送信するgTTS"""
+
+    def stream(self) -> Iterator[bytes]:
+        """
+        TTS APIにリクエストを送信し、MP3データを順に返す
+
+        gTTS.streamはリクエストごとに新しいセッションを作成し、分割された
+        テキストを1つずつ直列に送信するため、共有セッションを使い回しつつ
+        分割されたリクエストを並列に送信する。結果は元の順序で返す。
+
+        Raises:
+            gTTSError: APIリクエストでエラーが発生した場合
+        """
+        prepared_requests = self._prepare_requests()
+        proxies = urllib.request.getproxies()
+        if len(prepared_requests) == 1:
+            yield self._fetch_part(prepared_requests[0], proxies)
+            return
+
+        yield from _part_executor.map(lambda pr: self._fetch_part(pr, proxies), prepared_requests)
+
+    def _fetch_part(self, prepared_request: requests.PreparedRequest, proxies: Dict[str, str]) -> bytes:
+        """
+        分割されたテキスト1つ分のリクエストを送信し、MP3データを返す
+
+        Args:
+            prepared_request (requests.PreparedRequest): 送信するリクエスト
+            proxies (Dict[str, str]): 使用するプロキシ
+
+        Returns:
+            bytes: MP3形式の音声データ
+
+        Raises:
+            gTTSError: APIリクエストでエラーが発生した場合
+        """
+        # 同時に送信するリクエストの数を制限する（レスポンスを読み終えるまで枠を使う）
+        with _request_slots:
+            try:
+                r = _session.send(prepared_request, verify=False, proxies=proxies, timeout=self.timeout)
+                r.raise_for_status()
+            except requests.exceptions.HTTPError:
+                raise gTTSError(tts=self, response=r)
+            except requests.exceptions.RequestException:
+                raise gTTSError(tts=self)
+
+            parts = []
+            for line in r.iter_lines(chunk_size=1024):
+                decoded_line = line.decode("utf-8")
+                if self.GOOGLE_TTS_RPC in decoded_line:
+                    audio_search = _AUDIO_RE.search(decoded_line)
+                    if audio_search is None:
+                        raise gTTSError(tts=self, response=r)
+                    parts.append(base64.b64decode(audio_search.group(1).encode("ascii")))
+        return b"".join(parts)
+
+
+@functools.lru_cache(maxsize=1)
+def _supported_lang_codes() -> FrozenSet[str]:
+    """
+    gTTSでサポートされている言語コードの集合を一度だけ作成する
+
+    Returns:
+        FrozenSet[str]: gTTSの言語コードの集合
+    """
+    return frozenset(lang.tts_langs())
+
+
+def _create_tts(text: str, lang: str, tld: str) -> _SessionGTTS:
+    """
+    言語コードを検証してgTTSのインスタンスを作成する
+
+    gTTS側の言語チェック(lang_check)は呼び出しのたびに対応言語の辞書を作り直すため、
+    無効にして事前に作成した言語コードの集合で検証する。
+
+    Args:
+        text (str): 読み上げるテキスト
+        lang (str): 使用する言語
+        tld (str): Google翻訳ホストのトップレベルドメイン
+
+    Returns:
+        _SessionGTTS: gTTSのインスタンス
+
+    Raises:
+        ValueError: 言語がgTTSでサポートされていない場合
+    """
+    if lang not in _supported_lang_codes():
+        raise ValueError(f"サポートされていない言語です: {lang}")
+    return _SessionGTTS(text=text, lang=lang, tld=tld, lang_check=False)
+
+
+def _synthesize_mp3(text: str, text_hash: bytes, lang: str, tld: str) -> bytes:
+    """
+    gTTSでテキストからMP3形式の音声データを生成する
+
+    ディスクキャッシュが有効な場合はディスクから読み込み、なければ合成して
+    バックグラウンドでディスクにも保存する。
+
+    Args:
+        text (str): 読み上げるテキスト
+        text_hash (bytes): テキストのハッシュ値
+        lang (str): 使用する言語
+        tld (str): Google翻訳ホストのトップレベルドメイン
+
+    Returns:
+        bytes: MP3形式の音声データ
+    """
+    disk_cache = _disk_cache
+    if disk_cache is None:
+        return b"".join(_create_tts(text, lang, tld).stream())
+
+    key = DiskCache.make_key(lang, tld, text_hash.hex())
+    data = disk_cache.get(key)
+    if data is None:
+        data = b"".join(_create_tts(text, lang, tld).stream())
+        disk_cache.put(key, data)
+    return data
+
+
+def _get_mp3(text: str, lang: str, tld: str) -> bytes:
+    """
+    MP3形式の音声データをメモリ上のキャッシュから取得し、なければ生成する
+
+    同じ(text, lang, tld)の組み合わせは合成済みのMP3をメモリから返し、
+    同時に同じ組み合わせが要求された場合は一度だけ合成する。
+    例外が発生した場合はキャッシュされない。
+    長いテキストでもキーが小さく済むように、テキストは一度だけハッシュ化してキーに使う。
+
+    Args:
+        text (str): 読み上げるテキスト
+        lang (str): 使用する言語
+        tld (str): Google翻訳ホストのトップレベルドメイン
+
+    Returns:
+        bytes: MP3形式の音声データ
+    """
+    text_hash = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    return _mp3_cache.get_or_compute((text_hash, lang, tld), lambda: _synthesize_mp3(text, text_hash, lang, tld))
+
+
+# VRCTとgTTSで言語名が異なる言語の、gTTS側の言語名の候補（小文字、優先順）
+_GTTS_NAME_OVERRIDES: Dict[str, Tuple[str, ...]] = {
+    "Chinese Simplified": ("chinese (simplified)", "chinese (mandarin)"),
+    "Chinese Traditional": ("chinese (mandarin/taiwan)",),
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _build_vrct_lang_map() -> Dict[str, str]:
+    """
+    VRCTの言語名からgTTSの言語コードへの対応表を一度だけ作成する
+
+    Returns:
+        Dict[str, str]: VRCTの言語名をキー、gTTSの言語コードを値とする辞書
+    """
+    gtts_langs = lang.tts_langs()
+    # gtts_langsは {'af': 'Afrikaans', ...} の形式なので、値とキーを反転させる
+    gtts_lang_names = {v.lower(): k for k, v in gtts_langs.items()}
+
+    supported_languages = {}
+    for name in vrct_lang_dict:
+        # 特殊ケースは候補の言語名を順に探し、それ以外は同じ言語名を探す
+        candidates = _GTTS_NAME_OVERRIDES.get(name, (name.lower(),))
+        for candidate in candidates:
+            code = gtts_lang_names.get(candidate)
+            if code is not None:
+                supported_languages[name] = code
+                break
+
+    # 呼び出し元の文字列と同一オブジェクトになりやすいようにキー・値をインターンしておく
+    return {sys.intern(name): sys.intern(code) for name, code in supported_languages.items()}
+
+
+@functools.lru_cache(maxsize=1)
+def _build_normalized_lang_map() -> Dict[str, str]:
+    """
+    小文字化したVRCTの言語名からgTTSの言語コードへの対応表を一度だけ作成する
+
+    Returns:
+        Dict[str, str]: 小文字化した言語名をキー、gTTSの言語コードを値とする辞書
+    """
+    return {sys.intern(name.lower()): code for name, code in _build_vrct_lang_map().items()}
+
+
+# トライ木の終端ノードに言語コードを格納するキー（1文字のキーと衝突しない）
+_TRIE_TERMINAL = ""
+
+
+@functools.lru_cache(maxsize=1)
+def _build_lang_trie() -> Dict[str, Any]:
+    """
+    小文字化した言語名からgTTSの言語コードを前方一致で引くトライ木を一度だけ作成する
+
+    Returns:
+        Dict[str, Any]: 1文字ごとに子ノードを持つ辞書のトライ木
+    """
+    root: Dict[str, Any] = {}
+    for name, code in _build_normalized_lang_map().items():
+        node = root
+        for char in name:
+            node = node.setdefault(char, {})
+        node[_TRIE_TERMINAL] = code
+    return root
+
+
+@functools.lru_cache(maxsize=1)
+def _build_lang_code_index() -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    小文字化した言語タグからgTTSの言語コードを引く索引を一度だけ作成する
+
+    Returns:
+        Tuple[Dict[str, str], Dict[str, str]]:
+            小文字化した言語コードをキーとする辞書と、
+            基本言語コード ("pt-BR" の "pt" など) をキーとする辞書
+    """
+    exact_codes: Dict[str, str] = {}
+    base_codes: Dict[str, str] = {}
+    # 基本言語コード自体がサポートされていればそれを優先し、なければ短いコードを優先する
+    for code in sorted(_supported_lang_codes(), key=len):
+        lowered = code.lower()
+        exact_codes[lowered] = code
+        base_codes.setdefault(lowered.split("-", 1)[0], code)
+    return exact_codes, base_codes
+
+
+@functools.lru_cache(maxsize=128)
+def _match_language_name(name: str) -> Optional[str]:
+    """
+    表記の揺れた言語名からgTTSの言語コードを探す
+
+    前後の空白と大文字小文字を無視して言語名・言語タグと照合し、見つからない場合は
+    最も長く前方一致する言語名の言語コードを返す。同じ言語名が繰り返し渡されるため、
+    結果をメモ化する。
+
+    Args:
+        name (str): 言語名
+
+    Returns:
+        Optional[str]: gTTSの言語コード。対応する言語がない場合はNone。
+    """
+    normalized = name.strip().lower()
+    code = _build_normalized_lang_map().get(normalized)
+    if code is not None:
+        return code
+
+    # "en-US" や "pt_BR" のような言語タグは言語コード、基本言語コードの順に照合する
+    exact_codes, base_codes = _build_lang_code_index()
+    tag = normalized.replace("_", "-")
+    code = exact_codes.get(tag) or base_codes.get(tag.split("-", 1)[0])
+    if code is not None:
+        return code
+
+    node = _build_lang_trie()
+    for char in normalized:
+        node = node.get(char)
+        if node is None:
+            break
+        code = node.get(_TRIE_TERMINAL, code)
+    return code
+
+
+class gTTSSpeaker(BaseSpeaker):
     """gTTSの音声を特定のスピーカーデバイスで再生するクラス"""
 
-    def __init__(self, player: AudioPlayer, lang: str = "ja"):
+    __slots__ = ("lang", "tld")
+
+    def __init__(self, player: AudioPlayer, lang: str = "ja", tld: str = "com"):
         """
         gTTSSpeakerの初期化
 
         Args:
             player (AudioPlayer): オーディオ再生を処理するAudioPlayerインスタンス
             lang (str, optional): gTTSで使用する言語。デフォルトは "ja" (日本語)。
+            tld (str, optional): Google翻訳ホストのトップレベルドメイン。デフォルトは "com"。
         """
-        self.player = player
+        super().__init__(player)
         self.lang = lang
+        self.tld = tld
 
     @staticmethod
     def list_supported_languages() -> Dict[str, str]:
@@ -36,6 +350,105 @@ class gTTSSpeaker:
         """
         return lang.tts_langs()
 
+    @staticmethod
+    def is_supported_language(lang_code: str) -> bool:
+        """
+        言語コードがgTTSでサポートされているかを判定する
+
+        Args:
+            lang_code (str): gTTSの言語コード (例: "ja", "zh-TW")
+
+        Returns:
+            bool: サポートされている場合はTrue
+        """
+        return lang_code in _supported_lang_codes()
+
+    @staticmethod
+    def get_vrct_language_map() -> Dict[str, str]:
+        """
+        VRCTの言語名からgTTSの言語コードへの対応表を取得する
+
+        対応表は初回呼び出し時に一度だけ作成され、以降は同じ辞書を返す。
+        返された辞書は変更しないこと。
+
+        Returns:
+            Dict[str, str]: VRCTの言語名をキー、gTTSの言語コードを値とする辞書
+        """
+        return _build_vrct_lang_map()
+
+    @staticmethod
+    def resolve_language(name: str) -> Optional[str]:
+        """
+        言語名からgTTSの言語コードを取得する
+
+        VRCTの言語名と完全一致しない場合は、前後の空白と大文字小文字を無視して照合し、
+        それでも見つからない場合（"English (US)" や "japanese-formal" など）は
+        最も長く前方一致する言語名の言語コードを返す。
+
+        Args:
+            name (str): VRCTの言語名、gTTSの言語コード、または "pt-BR" のような言語タグ
+
+        Returns:
+            Optional[str]: gTTSの言語コード。対応する言語がない場合はNone。
+        """
+        # gTTSの言語コードが渡された場合はそのまま返す
+        if name in _supported_lang_codes():
+            return name
+
+        # 正規化済みの言語名はそのまま引けるので、文字列の変換を行わない
+        code = _build_vrct_lang_map().get(name)
+        if code is not None:
+            return code
+
+        return _match_language_name(name)
+
+    @staticmethod
+    def warmup(tld: str = "com") -> bool:
+        """
+        Google翻訳ホストへの接続を事前に確立しておく
+
+        共有HTTPセッションで軽量なリクエストを送信し、DNS解決とTCP/TLS接続を済ませておくことで、
+        最初の音声合成で接続確立を待たないようにする。
+
+        Args:
+            tld (str, optional): Google翻訳ホストのトップレベルドメイン。デフォルトは "com"。
+
+        Returns:
+            bool: 接続できた場合はTrue
+        """
+        try:
+            _session.head(_translate_url(tld=tld, path=""), verify=False,
+                          proxies=urllib.request.getproxies(), timeout=5)
+            return True
+        except requests.exceptions.RequestException:
+            return False
+
+    @staticmethod
+    def set_disk_cache_dir(path: Optional[str]) -> None:
+        """
+        合成済みMP3データを保存するディスクキャッシュのディレクトリを設定する
+
+        Args:
+            path (Optional[str]): キャッシュを保存するディレクトリ。Noneの場合はディスクキャッシュを無効にする。
+        """
+        global _disk_cache
+        _disk_cache = DiskCache(path, ".mp3") if path is not None else None
+
+    @staticmethod
+    def cache_clear() -> None:
+        """合成済みMP3データのメモリ上のキャッシュを消去する"""
+        _mp3_cache.clear()
+
+    @staticmethod
+    def cache_info() -> CacheInfo:
+        """
+        合成済みMP3データのキャッシュの統計情報を取得する
+
+        Returns:
+            CacheInfo: ヒット数・ミス数・最大件数・現在の件数
+        """
+        return _mp3_cache.cache_info()
+
     def get_audio_data(self, text: str, lang: Optional[str] = None) -> bytes:
         """
         指定されたテキストからWAV形式の音声データを生成して返す
@@ -49,48 +462,74 @@ class gTTSSpeaker:
         """
         current_lang = lang if lang else self.lang
 
-        # gTTSでMP3データを生成
-        mp3_fp = io.BytesIO()
-        tts = gTTS(text=text, lang=current_lang)
-        tts.write_to_fp(mp3_fp)
-        mp3_fp.seek(0)
+        # 複数の文からなるテキストは文ごとに並列で合成して連結する
+        # (gTTSのMP3は固定ビットレートのため、単純な連結で再生できる)
+        parts = synthesize_sentences(text, lambda s: _get_mp3(s, current_lang, self.tld))
+        mp3_data = b"".join(parts)
 
         # miniaudioでMP3をデコードし、WAV形式のバイトデータを作成
-        decoded = miniaudio.decode(mp3_fp.read())
-        wav_fp = io.BytesIO()
-        with wave.open(wav_fp, "wb") as wf:
-            wf.setnchannels(decoded.nchannels)
-            wf.setsampwidth(decoded.sample_width)
-            wf.setframerate(decoded.sample_rate)
-            wf.writeframes(decoded.samples)
-        wav_fp.seek(0)
-        return wav_fp.read()
+        decoded = miniaudio.decode(mp3_data)
+        return build_wav(decoded.samples, decoded.nchannels, decoded.sample_width, decoded.sample_rate)
 
-    def speak(self, text: str, lang: Optional[str] = None, wait: bool = True) -> None:
+    def synthesize_many(
+        self,
+        items: List[Tuple[str, Optional[str]]],
+        return_exceptions: bool = False
+    ) -> List[Union[bytes, Exception]]:
         """
-        指定されたテキストを音声合成して再生する
+        複数のテキストを並列で音声合成し、WAV形式の音声データのリストを返す
+
+        Args:
+            items (List[Tuple[str, Optional[str]]]): (テキスト, 言語) のリスト。言語がNoneの場合はインスタンスのデフォルト言語を使用。
+            return_exceptions (bool, optional): Trueの場合、合成に失敗した項目は例外オブジェクトを結果に含める。
+                Falseの場合は最初に失敗した項目の例外を送出する。デフォルトはFalse。
+
+        Returns:
+            List[Union[bytes, Exception]]: itemsと同じ順序の音声データ（または例外）のリスト
+        """
+        def synthesize(item: Tuple[str, Optional[str]]) -> Union[bytes, Exception]:
+            text, item_lang = item
+            try:
+                return self.get_audio_data(text, item_lang)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return e
+
+        return list(_batch_executor.map(synthesize, items))
+
+    def stream_mp3(self, text: str, lang: Optional[str] = None) -> Iterator[bytes]:
+        """
+        指定されたテキストからMP3形式の音声データを取得した順に返す
+
+        音声データ全体をバッファに溜めずに、分割されたテキストごとのMP3データを
+        そのまま返す。キャッシュは使用しない。
 
         Args:
             text (str): 読み上げるテキスト
             lang (Optional[str], optional): 使用する言語。Noneの場合はインスタンスのデフォルト言語を使用。
-            wait (bool, optional): 再生が終了するまで待機するかどうか。デフォルトはTrue。
+
+        Yields:
+            bytes: MP3形式の音声データの断片
+
+        Raises:
+            ValueError: 言語がgTTSでサポートされていない場合
+            gTTSError: APIリクエストでエラーが発生した場合
         """
-        audio_data = self.get_audio_data(text, lang)
-        self.play_bytes(audio_data, wait=wait)
+        current_lang = lang if lang else self.lang
+        yield from _create_tts(text, current_lang, self.tld).stream()
 
-    def play_bytes(self, audio_data: bytes, wait: bool = True) -> None:
+    def speak(self, text: str, lang: Optional[str] = None, wait: bool = True) -> None:
         """
-        バイト形式の音声データを再生する
+        指定されたテキストを音声合成して再生する
 
         Args:
-            audio_data (bytes): 再生するWAV形式の音声データ
+            text (str): 読み上げるテキスト
+            lang (Optional[str], optional): 使用する言語。Noneの場合はインスタンスのデフォルト言語を使用。
             wait (bool, optional): 再生が終了するまで待機するかどうか。デフォルトはTrue。
         """
-        self.player.play_wav_bytes(audio_data, wait=wait)
-
-    def request_stop(self) -> None:
-        """再生の停止をリクエストする"""
-        self.player.request_stop()
+        audio_data = self.get_audio_data(text, lang)
+        self.play_bytes(audio_data, wait=wait)
 
 # 使用例
 if __name__ == "__main__":
@@ -9,26 +9,49 @@ CustomTkinterを使用したVRCT-TTSの設定GUI
 import os
 import sys
 import threading
+import time
 import ctypes
 import customtkinter as ctk
-from typing import Dict, List, Optional, Any, Union
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Tuple, Union
 import websocket
+import requests
 import json
+import queue
 import html
 import re
-import struct
-import io
-import wave
 import numpy as np
 
 from voicevox import VOICEVOXClient
-from audio_player import AudioPlayer
+from audio_player import AudioPlayer, BaseSpeaker
+from tts_utils import parse_wav, build_wav
 from voicevox_speaker import VoicevoxSpeaker
 from gTTS_speaker import gTTSSpeaker
-from vrct_languages import vrct_lang_dict
 from config import Config
 from language import texts
 
+# 受信メッセージのJSONの解析には高速なorjsonを使用し、なければ標準のjsonを使用する
+# (orjson.JSONDecodeErrorはjson.JSONDecodeErrorのサブクラス)
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# TTSエンジン名（設定ファイルとUIの選択肢に使用する）
+ENGINE_VOICEVOX = "VOICEVOX"
+ENGINE_GTTS = "gTTS"
+
+# 受信メッセージのキーが存在しない場合の既定値（呼び出しごとに空の辞書・リストを作成しない）
+_EMPTY_DICT: Mapping[str, Any] = MappingProxyType({})
+_EMPTY_TUPLE: Tuple[Any, ...] = ()
+
+# VOICEVOXに接続できなかった後、再接続を試みずにエラーとする秒数（続けて失敗するたびに倍にする）
+VOICEVOX_RETRY_INTERVAL = 1.0
+VOICEVOX_RETRY_INTERVAL_MAX = 16.0
+
+# 最初のメッセージの受信後、続くメッセージをまとめて読み上げるために待つ秒数
+MESSAGE_COALESCE_WINDOW = 0.1
+
 
 class VRCTTTSConnectorGUI(ctk.CTk):
     """VRCT-TTSアプリケーション"""
@@ -61,6 +84,11 @@ class VRCTTTSConnectorGUI(ctk.CTk):
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
         self.speakers_data: List[Dict[str, Any]] = []
+        # speakers_dataから作成する検索用の辞書（_index_speakersで作成する）
+        self._speakers_by_name: Dict[str, Dict[str, Any]] = {}
+        self._speaker_by_style_id: Dict[int, Dict[str, Any]] = {}
+        self._style_labels: Dict[str, List[str]] = {}
+        self._style_id_by_label: Dict[str, int] = {}
         self.audio_devices: List[Dict[str, Any]] = []
         self.current_character: Optional[Dict[str, Any]] = None
         self.current_style: Optional[int] = None
@@ -73,11 +101,13 @@ class VRCTTTSConnectorGUI(ctk.CTk):
         self.speed: float = 1.0 # デフォルトの再生速度 (0.5-2.0)
         self.ws_url: str = "ws://127.0.0.1:2231"
         self.gtts_lang: str = "English"
-        self.source_tts_engine: str = "VOICEVOX"
-        self.dest_tts_engine: str = "gTTS"
+        self.gtts_lang_code: str = "en"  # gtts_langに対応するgTTSの言語コード
+        self.source_tts_engine: str = ENGINE_VOICEVOX
+        self.dest_tts_engine: str = ENGINE_GTTS
         self.play_source: bool = False
         self.play_dest: bool = True
         self.language: str = "English"
+        self.profile_synthesis: bool = False
 
         # UI Variables
         self.character_var = ctk.StringVar()
@@ -109,7 +139,23 @@ class VRCTTTSConnectorGUI(ctk.CTk):
         # Playback lock
         self.playback_lock = threading.Lock()
         self.clear_audio_requested: bool = False
-        self.active_speaker_instance: Optional[Union[VoicevoxSpeaker, gTTSSpeaker]] = None
+        self.active_speaker_instance: Optional[BaseSpeaker] = None
+
+        # 再生デバイスの設定が変わるまで使い回すAudioPlayerと話者インスタンス
+        self._speaker_device_key: Optional[tuple] = None
+        self._speakers: Dict[str, Union[VoicevoxSpeaker, gTTSSpeaker]] = {}
+        self._speaker_lock = threading.Lock()
+
+        # VOICEVOXに最後に接続できなかった時刻 (time.monotonic()の値)
+        self._voicevox_failed_at: Optional[float] = None
+        # 次に再接続を試みるまでの秒数
+        self._voicevox_retry_interval: float = VOICEVOX_RETRY_INTERVAL
+
+        # WebSocketで受信したメッセージのキューと、それを処理するスレッド
+        self._message_queue: "queue.Queue[str]" = queue.Queue()
+        self._message_worker_thread: Optional[threading.Thread] = None
+        # 受信済みのメッセージを破棄するたびに増やす（破棄前に取り出したメッセージを読み上げないため）
+        self._message_generation: int = 0
 
         # 設定を読み込む
         self.load_config()
@@ -118,10 +164,15 @@ class VRCTTTSConnectorGUI(ctk.CTk):
         self.texts = texts
 
         # VOICEVOXクライアントの初期化
-        self.client: VOICEVOXClient = VOICEVOXClient()
+        # 合成した音声は音声合成用のクエリをキーにアプリケーションフォルダにキャッシュする
+        # (ユーザー辞書の変更などでクエリが変わった場合は合成し直す)
+        self.client: VOICEVOXClient = VOICEVOXClient(cache_dir=os.path.join(self.app_path, "cache", "voicevox"))
 
         # gTTSでサポートされている言語のリストを作成
-        self.gtts_supported_languages: Dict[str, str] = self._create_gtts_lang_list()
+        self.gtts_supported_languages: Dict[str, str] = gTTSSpeaker.get_vrct_language_map()
+
+        # 合成した音声をアプリケーションフォルダにキャッシュする
+        gTTSSpeaker.set_disk_cache_dir(os.path.join(self.app_path, "cache", "gtts"))
 
         # UIの作成
         self.create_ui()
@@ -132,28 +183,6 @@ class VRCTTTSConnectorGUI(ctk.CTk):
         # プロトコルハンドラー
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
 
-    def _create_gtts_lang_list(self) -> Dict[str, str]:
-        """gTTSでサポートされている言語の辞書を作成する"""
-        gtts_langs = gTTSSpeaker.list_supported_languages()
-        # gtts_langsは {'af': 'Afrikaans', ...} の形式なので、値とキーを反転させる
-        gtts_lang_names = {v.lower(): k for k, v in gtts_langs.items()}
-
-        supported_languages = {}
-        for name, code in vrct_lang_dict.items():
-            # 中国語の特殊ケースを処理
-            if name == "Chinese Simplified":
-                if "chinese (simplified)" in gtts_lang_names:
-                    supported_languages[name] = gtts_lang_names["chinese (simplified)"]
-                elif "chinese (mandarin)" in gtts_lang_names:
-                    supported_languages[name] = gtts_lang_names["chinese (mandarin)"]
-            elif name == "Chinese Traditional":
-                if "chinese (mandarin/taiwan)" in gtts_lang_names:
-                    supported_languages[name] = gtts_lang_names["chinese (mandarin/taiwan)"]
-            elif name.lower() in gtts_lang_names:
-                supported_languages[name] = gtts_lang_names[name.lower()]
-
-        return supported_languages
-
     def create_ui(self) -> None:
         """UIコンポーネントの作成"""
         # Initialize other StringVars that were previously Optional
@@ -374,7 +403,7 @@ class VRCTTTSConnectorGUI(ctk.CTk):
         self.source_tts_engine_dropdown = ctk.CTkComboBox(
             tts_frame,
             variable=self.source_tts_engine_var,
-            values=["VOICEVOX", "gTTS"],
+            values=[ENGINE_VOICEVOX, ENGINE_GTTS],
             font=self.font_normal_14,
             state="readonly",
             command=self.on_source_tts_engine_change
@@ -397,7 +426,7 @@ class VRCTTTSConnectorGUI(ctk.CTk):
         self.dest_tts_engine_dropdown = ctk.CTkComboBox(
             tts_frame,
             variable=self.dest_tts_engine_var,
-            values=["gTTS", "VOICEVOX"],
+            values=[ENGINE_GTTS, ENGINE_VOICEVOX],
             font=self.font_normal_14,
             state="readonly",
             command=self.on_dest_tts_engine_change
@@ -511,7 +540,7 @@ class VRCTTTSConnectorGUI(ctk.CTk):
         self.play_button: ctk.CTkButton = ctk.CTkButton(
             replay_frame,
             text="再生 (VOICEVOX)",
-            command=lambda: self.play_test_audio("VOICEVOX"),
+            command=lambda: self.play_test_audio(ENGINE_VOICEVOX),
             font=self.font_normal_14
         )
         self.play_button.pack(side="left", padx=(0, 5))
@@ -519,7 +548,7 @@ class VRCTTTSConnectorGUI(ctk.CTk):
         self.play_gtts_button: ctk.CTkButton = ctk.CTkButton(
             replay_frame,
             text="再生 (gTTS)",
-            command=lambda: self.play_test_audio("gTTS"),
+            command=lambda: self.play_test_audio(ENGINE_GTTS),
             font=self.font_normal_14
         )
         self.play_gtts_button.pack(side="left", fill="x", expand=True)
@@ -575,6 +604,28 @@ class VRCTTTSConnectorGUI(ctk.CTk):
 
         self.update_ui_text()
 
+    def _is_voicevox_available(self) -> bool:
+        """
+        VOICEVOXでの合成を試みるかどうかを判定する
+
+        Returns:
+            bool: 最後に接続できなかった時刻から_voicevox_retry_interval秒以上経過している場合はTrue
+                (それまでは接続を試みずにエラーとする)
+        """
+        failed_at = self._voicevox_failed_at
+        return failed_at is None or time.monotonic() - failed_at >= self._voicevox_retry_interval
+
+    def _mark_voicevox_failed(self) -> None:
+        """VOICEVOXに接続できなかったことを記録し、続けて失敗した場合は再接続までの間隔を延ばす"""
+        if self._voicevox_failed_at is not None:
+            self._voicevox_retry_interval = min(self._voicevox_retry_interval * 2, VOICEVOX_RETRY_INTERVAL_MAX)
+        self._voicevox_failed_at = time.monotonic()
+
+    def _mark_voicevox_available(self) -> None:
+        """VOICEVOXに接続できたことを記録し、再接続までの間隔を元に戻す"""
+        self._voicevox_failed_at = None
+        self._voicevox_retry_interval = VOICEVOX_RETRY_INTERVAL
+
     def _load_data_async(self) -> None:
         """非同期でデータを読み込む"""
         try:
@@ -590,6 +641,8 @@ class VRCTTTSConnectorGUI(ctk.CTk):
         try:
             # VOICEVOX Engineからスピーカー情報を取得
             self.speakers_data = self.client.speakers()
+            self._index_speakers()
+            self._mark_voicevox_available()
             # UIの更新（メインスレッドで実行）
             self.after(0, self._update_ui_with_voicevox_speakers)
             self.after(0, lambda: self.status_var.set(self.texts[self.language]["status_voicevox_loaded"]))
@@ -599,6 +652,34 @@ class VRCTTTSConnectorGUI(ctk.CTk):
                 0, lambda: self.status_var.set(self.texts[self.language]["status_voicevox_connection_error"]))
             self.after(0, self._disable_voicevox_ui)
 
+        # gTTSの接続を事前に確立しておく
+        gTTSSpeaker.warmup()
+
+    def _index_speakers(self) -> None:
+        """
+        スピーカー情報から、名前・スタイルIDでの検索用の辞書とスタイルの表示名を作成する
+
+        キャラクターやスタイルを選択するたびにスピーカー情報全体を走査しないように、読み込み時に一度だけ作成する。
+        """
+        speakers_by_name: Dict[str, Dict[str, Any]] = {}
+        speaker_by_style_id: Dict[int, Dict[str, Any]] = {}
+        style_labels: Dict[str, List[str]] = {}
+        style_id_by_label: Dict[str, int] = {}
+        for speaker in self.speakers_data:
+            speakers_by_name.setdefault(speaker["name"], speaker)
+            labels: List[str] = []
+            for style in speaker["styles"]:
+                label = f"{style['name']} (ID: {style['id']})"
+                labels.append(label)
+                speaker_by_style_id.setdefault(style["id"], speaker)
+                style_id_by_label[label] = style["id"]
+            style_labels.setdefault(speaker["name"], labels)
+
+        self._speakers_by_name = speakers_by_name
+        self._speaker_by_style_id = speaker_by_style_id
+        self._style_labels = style_labels
+        self._style_id_by_label = style_id_by_label
+
     def _update_ui_with_audio_devices(self) -> None:
         """取得したオーディオデバイスデータでUIを更新する"""
         # ホストリストの作成
@@ -625,6 +706,7 @@ class VRCTTTSConnectorGUI(ctk.CTk):
         # デバイスリストを更新
         self._update_device_lists()
         self.status_var.set(self.texts[self.language]["status_audio_device_loaded"])
+        self._prime_audio_player()
 
     def _update_ui_with_voicevox_speakers(self) -> None:
         """取得したVOICEVOXスピーカーデータでUIを更新する"""
@@ -643,12 +725,12 @@ class VRCTTTSConnectorGUI(ctk.CTk):
         self.style_var.set(self.texts[self.language]["status_voicevox_unavailable"])
         self.play_button.configure(state="disabled")
         # 翻訳前後のTTSエンジン選択でVOICEVOXが選択されていたらgTTSに変更する
-        if self.source_tts_engine_var.get() == "VOICEVOX":
-            self.source_tts_engine_var.set("gTTS")
-            self.on_source_tts_engine_change("gTTS")
-        if self.dest_tts_engine_var.get() == "VOICEVOX":
-            self.dest_tts_engine_var.set("gTTS")
-            self.on_dest_tts_engine_change("gTTS")
+        if self.source_tts_engine_var.get() == ENGINE_VOICEVOX:
+            self.source_tts_engine_var.set(ENGINE_GTTS)
+            self.on_source_tts_engine_change(ENGINE_GTTS)
+        if self.dest_tts_engine_var.get() == ENGINE_VOICEVOX:
+            self.dest_tts_engine_var.set(ENGINE_GTTS)
+            self.on_dest_tts_engine_change(ENGINE_GTTS)
 
     def _update_device_lists(self) -> None:
         """選択されたホストに基づいてデバイスリストを更新"""
@@ -710,12 +792,11 @@ class VRCTTTSConnectorGUI(ctk.CTk):
 
         # 設定から選択されたキャラクターを復元
         if self.current_style is not None:
-            for speaker in self.speakers_data:
-                for style_info in speaker["styles"]:
-                    if style_info["id"] == self.current_style:
-                        self.character_var.set(speaker["name"])
-                        self.select_character(speaker)
-                        return
+            speaker = self._speaker_by_style_id.get(self.current_style)
+            if speaker is not None:
+                self.character_var.set(speaker["name"])
+                self.select_character(speaker)
+                return
         # デフォルト選択（最初のキャラクター）
         elif self.speakers_data:
             self.character_var.set(self.speakers_data[0]["name"])
@@ -737,8 +818,7 @@ class VRCTTTSConnectorGUI(ctk.CTk):
             return
 
         # 選択されたキャラクター名からキャラクターデータを取得
-        selected_speaker: Optional[Dict[str, Any]] = next(
-            (s for s in self.speakers_data if s["name"] == choice), None)
+        selected_speaker: Optional[Dict[str, Any]] = self._speakers_by_name.get(choice)
         if selected_speaker:
             self.select_character(selected_speaker)
         self.save_config()
@@ -748,7 +828,7 @@ class VRCTTTSConnectorGUI(ctk.CTk):
         self.current_character = speaker
 
         # スタイルドロップダウンの更新
-        style_values: List[str] = [
+        style_values: List[str] = self._style_labels.get(speaker["name"]) or [
             f"{style['name']} (ID: {style['id']})" for style in speaker["styles"]]
         self.style_dropdown.configure(values=style_values)
 
@@ -775,6 +855,12 @@ class VRCTTTSConnectorGUI(ctk.CTk):
             return
 
         # 選択されたスタイルからIDを取得
+        style_id_from_label: Optional[int] = self._style_id_by_label.get(choice)
+        if style_id_from_label is not None:
+            self.current_style = style_id_from_label
+            self.save_config()
+            return
+
         try:
             id_match: Optional[re.Match[str]] = re.search(
                 r'\(ID: (\d+)\)', choice)
@@ -819,6 +905,7 @@ class VRCTTTSConnectorGUI(ctk.CTk):
     def on_gtts_lang_change(self, choice: str) -> None:
         """gTTSの言語が変更されたときの処理"""
         self.gtts_lang = choice
+        self.gtts_lang_code = gTTSSpeaker.get_vrct_language_map().get(choice, "en")
         self.save_config()
 
     def on_host_change(self, choice: str) -> None:
@@ -847,6 +934,7 @@ class VRCTTTSConnectorGUI(ctk.CTk):
         except (IndexError, ValueError):
             self.current_device = None
         self.save_config()
+        self._prime_audio_player()
 
     def on_device_2_change(self, choice: str) -> None:
         """第2デバイスが変更されたときの処理"""
@@ -862,6 +950,7 @@ class VRCTTTSConnectorGUI(ctk.CTk):
             print(f"第2デバイス選択エラー: {str(e)}")
             self.current_device_2 = None
         self.save_config()
+        self._prime_audio_player()
 
 
     def on_speaker_2_enable_change(self) -> None:
@@ -869,6 +958,7 @@ class VRCTTTSConnectorGUI(ctk.CTk):
         if hasattr(self, 'speaker_2_enabled_var'):
             self.speaker_2_enabled = self.speaker_2_enabled_var.get()
         self.save_config()
+        self._prime_audio_player()
 
 
     def on_volume_change(self, value: float) -> None:
@@ -935,51 +1025,30 @@ class VRCTTTSConnectorGUI(ctk.CTk):
 
         self._update_device_lists()
 
-    def _process_audio(self, audio_data: bytes, speaker_instance: Union[VoicevoxSpeaker, gTTSSpeaker], engine: str) -> None:
+    def _process_audio(self, audio_data: bytes, speaker_instance: BaseSpeaker, engine: str) -> None:
         """音量と再生速度を適用して音声を再生する"""
         if self.clear_audio_requested:
             return
 
         try:
-            # WAVデータをバッファに読み込み
-            with io.BytesIO(audio_data) as buffer:
-                with wave.open(buffer, 'rb') as wf:
-                    # WAVファイルのパラメータを取得
-                    n_channels = wf.getnchannels()
-                    sample_width = wf.getsampwidth()
-                    frame_rate = wf.getframerate()
-                    n_frames = wf.getnframes()
-
-                    # すべてのフレームを読み込む
-                    raw_data = wf.readframes(n_frames)
+            # WAVファイルのパラメータとPCMサンプルを取得（PCMサンプルはコピーせずに参照する）
+            n_channels, sample_width, frame_rate, raw_data = parse_wav(audio_data)
 
             # 音量を適用
-            if sample_width == 2:  # 16bit PCM
-                fmt = f"{n_frames * n_channels}h"
-                data = np.array(struct.unpack(fmt, raw_data))
-                # 音量を適用
-                data = (data * self.volume).astype(np.int16)
-                # データをバイトに戻す
-                modified_raw_data = struct.pack(fmt, *data)
+            if sample_width == 2 and self.volume != 1.0:  # 16bit PCM
+                data = np.frombuffer(raw_data[:len(raw_data) & ~1], dtype="<i2")
+                modified_raw_data = (data * self.volume).astype("<i2")
             else:
                 modified_raw_data = raw_data
 
             # gTTSの場合、再生速度を適用 (フレームレートを変更)
-            if engine == "gTTS":
+            if engine == ENGINE_GTTS:
                 new_frame_rate = int(frame_rate * self.speed)
             else:
                 new_frame_rate = frame_rate
 
             # 新しいWAVファイルを作成
-            with io.BytesIO() as out_buffer:
-                with wave.open(out_buffer, 'wb') as out_wf:
-                    out_wf.setnchannels(n_channels)
-                    out_wf.setsampwidth(sample_width)
-                    out_wf.setframerate(new_frame_rate)
-                    out_wf.writeframes(modified_raw_data)
-
-                # バッファからバイトデータを取得
-                processed_audio_data = out_buffer.getvalue()
+            processed_audio_data = build_wav(modified_raw_data, n_channels, sample_width, new_frame_rate)
 
             # 修正したデータを再生
             speaker_instance.play_bytes(processed_audio_data)
@@ -992,7 +1061,7 @@ class VRCTTTSConnectorGUI(ctk.CTk):
 
     def play_test_audio(self, engine: str) -> None:
         """テスト音声を再生"""
-        if engine == "VOICEVOX":
+        if engine == ENGINE_VOICEVOX:
             # スタイルIDが設定されているか確認し、されていない場合は現在のキャラクターの最初のスタイルを選択
             if not self.current_style and self.current_character and self.current_character["styles"]:
                 self.current_style = self.current_character["styles"][0]["id"]
@@ -1013,11 +1082,55 @@ class VRCTTTSConnectorGUI(ctk.CTk):
 
         # スレッドで非同期に合成と再生
         thread: threading.Thread = threading.Thread(
-            target=self._play_audio_async, args=(text, engine), daemon=True)
+            target=self._play_audio_async, args=(text, engine), kwargs={"force_voicevox": True}, daemon=True)
         thread.start()
 
-    def _play_audio_async(self, text: str, engine: str, lang: Optional[str] = None) -> None:
-        """非同期で音声合成と再生を行う"""
+    def _get_speaker(self, engine: str) -> Union[VoicevoxSpeaker, gTTSSpeaker]:
+        """
+        現在の再生デバイス設定に対応する話者インスタンスを取得する
+
+        デバイス設定が変わらない間は、AudioPlayer(PyAudio)と話者インスタンスを使い回す。
+
+        Args:
+            engine (str): TTSエンジン名 ("VOICEVOX" または "gTTS")
+
+        Returns:
+            Union[VoicevoxSpeaker, gTTSSpeaker]: 話者インスタンス
+        """
+        device_key = (self.current_device, self.current_device_2, self.speaker_2_enabled)
+        with self._speaker_lock:
+            if device_key != self._speaker_device_key:
+                audio_player = AudioPlayer(
+                    output_device_index=self.current_device,
+                    output_device_index_2=self.current_device_2,
+                    speaker_2_enabled=self.speaker_2_enabled
+                )
+                self._speakers = {
+                    ENGINE_VOICEVOX: VoicevoxSpeaker(player=audio_player, client=self.client),
+                    ENGINE_GTTS: gTTSSpeaker(player=audio_player),
+                }
+                self._speaker_device_key = device_key
+            return self._speakers[engine]
+
+    def _prime_audio_player(self) -> None:
+        """
+        現在のデバイス設定の出力ストリームを、VOICEVOXの出力形式で事前に開いておく
+
+        最初の再生でストリームを開く時間を待たないように、別スレッドで開く。
+        """
+        threading.Thread(target=lambda: self._get_speaker(ENGINE_VOICEVOX).player.prime(), daemon=True).start()
+
+    def _play_audio_async(self, text: str, engine: str, lang: Optional[str] = None, force_voicevox: bool = False) -> None:
+        """
+        非同期で音声合成と再生を行う
+
+        Args:
+            text (str): 読み上げるテキスト
+            engine (str): TTSエンジン名 ("VOICEVOX" または "gTTS")
+            lang (Optional[str], optional): gTTSの言語コード。Noneの場合は設定の言語。
+            force_voicevox (bool, optional): 直前にVOICEVOXに接続できなかった場合でも接続を試みるかどうか。
+                手動のテスト再生で使用する。デフォルトはFalse。
+        """
         self.playback_lock.acquire()
         try:
             if self.clear_audio_requested:
@@ -1026,34 +1139,48 @@ class VRCTTTSConnectorGUI(ctk.CTk):
                 return
 
             self.active_speaker_instance = None # Reset before creation
-            audio_player = AudioPlayer(
-                output_device_index=self.current_device,
-                output_device_index_2=self.current_device_2,
-                speaker_2_enabled=self.speaker_2_enabled
-            )
 
             audio_data = None
             speaker_instance = None
+            # 合成時間の計測は設定で有効にした場合のみ行う
+            start_ns = time.perf_counter_ns() if self.profile_synthesis else 0
 
-            if engine == "VOICEVOX":
+            if engine == ENGINE_VOICEVOX:
                 if self.current_style is None:
                     self.after(0, lambda: self.status_var.set(self.texts[self.language]["error_no_style_selected"]))
                     return
                 
-                temp_speaker = VoicevoxSpeaker(player=audio_player, client=self.client)
-                audio_data = temp_speaker.get_audio_data(text, self.current_style, speed=self.speed)
-                speaker_instance = temp_speaker
+                # 接続できなかった直後は接続を試みず、すぐにエラーを表示する
+                if not force_voicevox and not self._is_voicevox_available():
+                    self.after(0, lambda: self.status_var.set(self.texts[self.language]["status_voicevox_connection_error"]))
+                    return
+
+                # 文ごとに合成し、前の文を再生している間に次の文を合成する
+                temp_speaker = self._get_speaker(engine)
+                self.active_speaker_instance = temp_speaker
+                try:
+                    for i, sentence_audio in enumerate(temp_speaker.iter_audio_data(text, self.current_style, speed=self.speed)):
+                        if i == 0 and self.profile_synthesis:
+                            print(f"音声合成時間 ({engine}, 最初の文): {(time.perf_counter_ns() - start_ns) / 1e6:.2f} ms")
+                        if self.clear_audio_requested:
+                            break
+                        self._process_audio(sentence_audio, temp_speaker, engine)
+                    self._mark_voicevox_available()
+                except requests.ConnectionError:
+                    self._mark_voicevox_failed()
+                    self.after(0, lambda: self.status_var.set(self.texts[self.language]["status_voicevox_connection_error"]))
+                    return
 
-            elif engine == "gTTS":
-                lang_code = lang
-                if lang_code is None:
-                    lang_name = self.gtts_lang
-                    lang_code = self.gtts_supported_languages.get(lang_name, "en")
+            elif engine == ENGINE_GTTS:
+                lang_code = lang if lang is not None else self.gtts_lang_code
 
-                temp_speaker = gTTSSpeaker(player=audio_player)
+                temp_speaker = self._get_speaker(engine)
                 audio_data = temp_speaker.get_audio_data(text, lang=lang_code)
                 speaker_instance = temp_speaker
 
+                if self.profile_synthesis:
+                    print(f"音声合成時間 ({engine}): {(time.perf_counter_ns() - start_ns) / 1e6:.2f} ms")
+
             if audio_data and speaker_instance:
                 self.active_speaker_instance = speaker_instance
                 self._process_audio(audio_data, self.active_speaker_instance, engine)
@@ -1083,11 +1210,13 @@ class VRCTTTSConnectorGUI(ctk.CTk):
         self.speed = config.get("speed", 1.0) # デフォルトは1.0
         self.ws_url = config.get("ws_url", "ws://127.0.0.1:2231")
         self.gtts_lang = config.get("gtts_lang", "English")
-        self.source_tts_engine = config.get("source_tts_engine", "VOICEVOX")
-        self.dest_tts_engine = config.get("dest_tts_engine", "gTTS")
+        self.gtts_lang_code = gTTSSpeaker.get_vrct_language_map().get(self.gtts_lang, "en")
+        self.source_tts_engine = config.get("source_tts_engine", ENGINE_VOICEVOX)
+        self.dest_tts_engine = config.get("dest_tts_engine", ENGINE_GTTS)
         self.play_source = config.get("play_source", False)
         self.play_dest = config.get("play_dest", True)
         self.language = config.get("language", "English")
+        self.profile_synthesis = config.get("profile_synthesis", False)
 
         # UI変数の設定
         self.gtts_lang_var.set(self.gtts_lang)
@@ -1115,6 +1244,7 @@ class VRCTTTSConnectorGUI(ctk.CTk):
             "play_source": self.play_source,
             "play_dest": self.play_dest,
             "language": self.language,
+            "profile_synthesis": self.profile_synthesis,
         }
         Config.save(config_data)
         self.ws_url = self.ws_url_var.get()
@@ -1146,52 +1276,8 @@ class VRCTTTSConnectorGUI(ctk.CTk):
 
         # WebSocketイベントハンドラ
         def on_message(ws: websocket.WebSocketApp, message: str) -> None:
-            try:
-                data: Dict[str, Any] = json.loads(message)
-                if data.get("type") not in ["SENT", "CHAT", "RECEIVED"]:
-                    return
-
-                if data.get("type") in ["SENT", "CHAT"]:
-                    # 元言語が日本語の場合
-                    if data.get("src_languages", {}).get("1", {}).get("language") == "Japanese":
-                        source_message = data.get("message", "")
-                        source_lang_name = "Japanese"
-                        translations = data.get("translation", [])
-                        dest_message = translations[0] if translations else ""
-                        dest_lang_name = data.get("dst_languages", {}).get("1", {}).get("language", "English")
-                    # 元言語が日本語以外の場合
-                    else:
-                        source_message = data.get("message", "")
-                        source_lang_name = data.get("src_languages", {}).get("1", {}).get("language", "English")
-                        dest_message = ""
-                        dest_lang_name = "Japanese" # デフォルトの宛先は日本語
-                        translations = data.get("translation", [])
-                        dst_languages = data.get("dst_languages", {})
-                        for i in range(1, 4):
-                            lang_info = dst_languages.get(str(i), {})
-                            if lang_info.get("language") == "Japanese" and len(translations) > i - 1:
-                                dest_message = translations[i - 1]
-                                break
-
-                    # メッセージをデコード
-                    source_message = html.unescape(source_message)
-                    dest_message = html.unescape(dest_message)
-
-                    self.after(0, lambda: self.status_var.set(
-                        f"{self.texts[self.language]['status_received_message']}{source_message[:30]}... / {dest_message[:30]}..."))
-
-                    # 音声合成と再生
-                    thread = threading.Thread(
-                        target=self._synthesize_and_play_from_ws,
-                        args=(source_message, dest_message, source_lang_name, dest_lang_name),
-                        daemon=True
-                    )
-                    thread.start()
-
-            except json.JSONDecodeError:
-                pass  # 無視
-            except Exception as e:
-                self.after(0, lambda msg=f"{self.texts[self.language]['error_message_processing']}{e}": self.status_var.set(msg))
+            # 受信スレッドでは解析・合成を行わず、キューに積むだけにして次のメッセージの受信を妨げない
+            self._message_queue.put(message)
 
         def on_error(ws: websocket.WebSocketApp, error: Exception) -> None:
             self.after(0, lambda: self.status_var.set(
@@ -1199,6 +1285,7 @@ class VRCTTTSConnectorGUI(ctk.CTk):
 
         def on_close(ws: websocket.WebSocketApp, close_status_code: Optional[int], close_msg: Optional[str]) -> None:
             self.ws_connected = False
+            self._discard_pending_messages()
             self.after(0, self._update_ws_status_disconnected)
 
         def on_open(ws: websocket.WebSocketApp) -> None:
@@ -1216,6 +1303,11 @@ class VRCTTTSConnectorGUI(ctk.CTk):
                 on_close=on_close
             )
 
+            # 受信したメッセージを処理するスレッドを起動
+            if self._message_worker_thread is None:
+                self._message_worker_thread = threading.Thread(target=self._message_worker, daemon=True)
+                self._message_worker_thread.start()
+
             # WebSocketクライアントを別スレッドで実行
             self.ws_thread = threading.Thread(
                 target=self.ws.run_forever, daemon=True)
@@ -1226,6 +1318,7 @@ class VRCTTTSConnectorGUI(ctk.CTk):
 
     def stop_websocket_connection(self) -> None:
         """WebSocket接続を停止する"""
+        self._discard_pending_messages()
         if self.ws:
             self.ws.close()
             self.ws = None
@@ -1248,26 +1341,189 @@ class VRCTTTSConnectorGUI(ctk.CTk):
             fg_color="#1E5631", hover_color="#2E8B57")  # 緑色
         self.status_var.set(self.texts[self.language]["status_ws_disconnected"])
 
+    def _message_worker(self) -> None:
+        """
+        WebSocketで受信したメッセージを順に処理する
+
+        最初のメッセージからMESSAGE_COALESCE_WINDOW秒の間に届いたメッセージと、
+        再生中に溜まったメッセージをまとめて取り出し、1回の合成で読み上げる。
+        """
+        while True:
+            batch = [self._message_queue.get()]
+            generation = self._message_generation
+            deadline = time.monotonic() + MESSAGE_COALESCE_WINDOW
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        batch.append(self._message_queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._message_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            messages = []
+            for message in batch:
+                parsed = self._parse_ws_message(message)
+                if parsed is not None:
+                    messages.append(parsed)
+            if messages:
+                self._play_ws_messages(messages, generation)
+
+    def _discard_pending_messages(self) -> None:
+        """
+        受信済みでまだ読み上げていないメッセージを破棄する
+
+        キューに残っているメッセージに加えて、処理スレッドが取り出し済みのメッセージも読み上げない。
+        """
+        self._message_generation += 1
+        while True:
+            try:
+                self._message_queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def _parse_ws_message(self, message: str) -> Optional[Tuple[str, str, str, str]]:
+        """
+        WebSocketで受信したメッセージから読み上げるテキストと言語を取り出す
+
+        Args:
+            message (str): 受信したJSON形式のメッセージ
+
+        Returns:
+            Optional[Tuple[str, str, str, str]]:
+                (翻訳前のテキスト, 翻訳後のテキスト, 翻訳前の言語名, 翻訳後の言語名)。読み上げないメッセージの場合はNone。
+        """
+        try:
+            data: Dict[str, Any] = _json_loads(message)
+            if data.get("type") not in ["SENT", "CHAT"]:
+                return None
+
+            # 元言語が日本語の場合
+            if data.get("src_languages", _EMPTY_DICT).get("1", _EMPTY_DICT).get("language") == "Japanese":
+                source_message = data.get("message", "")
+                source_lang_name = "Japanese"
+                translations = data.get("translation", _EMPTY_TUPLE)
+                dest_message = translations[0] if translations else ""
+                dest_lang_name = data.get("dst_languages", _EMPTY_DICT).get("1", _EMPTY_DICT).get("language", "English")
+            # 元言語が日本語以外の場合
+            else:
+                source_message = data.get("message", "")
+                source_lang_name = data.get("src_languages", _EMPTY_DICT).get("1", _EMPTY_DICT).get("language", "English")
+                dest_message = ""
+                dest_lang_name = "Japanese" # デフォルトの宛先は日本語
+                translations = data.get("translation", _EMPTY_TUPLE)
+                dst_languages = data.get("dst_languages", _EMPTY_DICT)
+                for i in range(1, 4):
+                    lang_info = dst_languages.get(str(i), _EMPTY_DICT)
+                    if lang_info.get("language") == "Japanese" and len(translations) > i - 1:
+                        dest_message = translations[i - 1]
+                        break
+
+            # メッセージをデコード（文字参照を含まない場合は走査・再作成を省く）
+            if "&" in source_message:
+                source_message = html.unescape(source_message)
+            if "&" in dest_message:
+                dest_message = html.unescape(dest_message)
+
+            # %.30sで切り詰めることで、スライスによる部分文字列を作成しない
+            self.after(0, lambda: self.status_var.set(
+                "%s%.30s... / %.30s..." % (self.texts[self.language]['status_received_message'], source_message, dest_message)))
+
+            return source_message, dest_message, source_lang_name, dest_lang_name
+
+        except json.JSONDecodeError:
+            return None  # 無視
+        except Exception as e:
+            self.after(0, lambda msg=f"{self.texts[self.language]['error_message_processing']}{e}": self.status_var.set(msg))
+            return None
+
+    def _play_ws_messages(self, messages: List[Tuple[str, str, str, str]], generation: int) -> None:
+        """
+        受信したメッセージを読み上げる
+
+        言語の組み合わせが同じ連続したメッセージは、テキストを連結して1回で合成・再生する。
+
+        Args:
+            messages (List[Tuple[str, str, str, str]]):
+                (翻訳前のテキスト, 翻訳後のテキスト, 翻訳前の言語名, 翻訳後の言語名) のリスト
+            generation (int): メッセージを取り出した時点の_message_generationの値
+        """
+        groups: List[Tuple[List[str], List[str], str, str]] = []
+        for source_text, dest_text, source_lang_name, dest_lang_name in messages:
+            if groups and groups[-1][2] == source_lang_name and groups[-1][3] == dest_lang_name:
+                group = groups[-1]
+            else:
+                group = ([], [], source_lang_name, dest_lang_name)
+                groups.append(group)
+            if source_text:
+                group[0].append(source_text)
+            if dest_text:
+                group[1].append(dest_text)
+
+        for source_texts, dest_texts, source_lang_name, dest_lang_name in groups:
+            # 取り出した後に切断やオーディオのクリアでメッセージが破棄された場合は、残りを読み上げない
+            if generation != self._message_generation:
+                break
+            self._synthesize_and_play_from_ws(
+                " ".join(source_texts), " ".join(dest_texts), source_lang_name, dest_lang_name)
+
     def _synthesize_and_play_from_ws(self, source_text: str, dest_text: str, source_lang_name: str, dest_lang_name: str) -> None:
         """WebSocketから受け取ったテキストを音声合成して再生する"""
-        # 翻訳前の再生
-        if self.play_source and source_text:
+        play_source = self.play_source and bool(source_text)
+        play_dest = self.play_dest and bool(dest_text)
+
+        if play_source:
             source_engine = self.source_tts_engine
-            source_lang_code = "ja" if source_engine == "VOICEVOX" else self.gtts_supported_languages.get(source_lang_name)
+            source_lang_code = "ja" if source_engine == ENGINE_VOICEVOX else gTTSSpeaker.resolve_language(source_lang_name)
+        if play_dest:
+            dest_engine = self.dest_tts_engine
+            dest_lang_code = "ja" if dest_engine == ENGINE_VOICEVOX else gTTSSpeaker.resolve_language(dest_lang_name)
+
+        # 翻訳前の音声の合成・再生中に、翻訳後の音声の合成を先に始めておく
+        # (合成結果はキャッシュされるため、翻訳後の再生時には合成を待たずに済む)
+        if play_source and source_lang_code and play_dest and dest_lang_code:
+            threading.Thread(
+                target=self._prefetch_audio, args=(dest_text, dest_engine, dest_lang_code), daemon=True).start()
+
+        # 翻訳前の再生
+        if play_source:
             if source_lang_code:
                 self._play_audio_async(source_text, source_engine, lang=source_lang_code)
             else:
                 self.after(0, lambda: self.status_var.set(f"{self.texts[self.language]['error_gtts_unsupported_source']}{source_lang_name}"))
 
         # 翻訳後の再生
-        if self.play_dest and dest_text:
-            dest_engine = self.dest_tts_engine
-            dest_lang_code = "ja" if dest_engine == "VOICEVOX" else self.gtts_supported_languages.get(dest_lang_name)
+        if play_dest:
             if dest_lang_code:
                 self._play_audio_async(dest_text, dest_engine, lang=dest_lang_code)
             else:
                 self.after(0, lambda: self.status_var.set(f"{self.texts[self.language]['error_gtts_unsupported_dest']}{dest_lang_name}"))
 
+    def _prefetch_audio(self, text: str, engine: str, lang: str) -> None:
+        """
+        再生する前に音声を合成してキャッシュしておく
+
+        エラーは再生時の合成で改めて表示されるため、ここでは無視する。
+
+        Args:
+            text (str): 読み上げるテキスト
+            engine (str): TTSエンジン名 ("VOICEVOX" または "gTTS")
+            lang (str): gTTSの言語コード
+        """
+        if engine == ENGINE_VOICEVOX and not self._is_voicevox_available():
+            return
+
+        try:
+            if engine == ENGINE_VOICEVOX:
+                if self.current_style is not None:
+                    self._get_speaker(engine).get_audio_data(text, self.current_style, speed=self.speed)
+                    self._mark_voicevox_available()
+            elif engine == ENGINE_GTTS:
+                self._get_speaker(engine).get_audio_data(text, lang=lang)
+        except Exception:
+            pass
+
     def _synthesize_and_play(self, text: str) -> None:
         """テキストを音声合成して再生する"""
         self.playback_lock.acquire()
@@ -1326,6 +1582,7 @@ class VRCTTTSConnectorGUI(ctk.CTk):
         self.update_idletasks()
 
         self.clear_audio_requested = True
+        self._discard_pending_messages()
 
         if self.active_speaker_instance:
             try:
@@ -1341,6 +1598,9 @@ class VRCTTTSConnectorGUI(ctk.CTk):
         # WebSocket接続を停止
         self.stop_websocket_connection()
 
+        # VOICEVOXとの接続を閉じる
+        self.client.close()
+
         # アプリケーションを破棄
         self.destroy()
 
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+tts_utils.split_sentences / synthesize_sentences のテスト
+"""
+
+import pytest
+
+from tts_utils import split_sentences, synthesize_sentences
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("はい！！", ["はい！！"]),
+    ("本当！？すごい", ["本当！？", "すごい"]),
+    ("え。。。", ["え。。。"]),
+    ("！？すごい", ["！？すごい"]),
+    ("こんにちは。元気？", ["こんにちは。", "元気？"]),
+    ("「はい。」と言った。次", ["「はい。」と言った。", "次"]),
+    ("Really?! Yes. Wait... ok", ["Really?!", "Yes.", "Wait...", "ok"]),
+    ("！", []),
+])
+def test_split_sentences(text, expected):
+    assert split_sentences(text) == expected
+
+
+@pytest.mark.parametrize("text", ["はい！！", "本当！？すごい", "え。。。", "Really?! Yes!!"])
+def test_synthesize_sentences_skips_punctuation_only_parts(text):
+    def synthesize(sentence):
+        # gTTSは記号だけのテキストでAssertionErrorになる
+        assert any(c.isalnum() for c in sentence), sentence
+        return sentence.encode("utf-8")
+
+    assert b"".join(synthesize_sentences(text, synthesize)).decode("utf-8").replace(" ", "") == text.replace(" ", "")
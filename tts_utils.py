@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+TTSエンジン共通のユーティリティモジュール
+"""
+
+import re
+import sys
+import math
+import struct
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Tuple
+
+import numpy as np
+
+# サンプルレートの変換には、あればscipyのポリフェーズフィルタを使用し、なければ線形補間で行う
+try:
+    from scipy.signal import resample_poly
+except ImportError:
+    resample_poly = None
+
+# 連続する文末記号の直後で分割する（和文は空白なし、欧文は後続の空白を区切りとする）
+# 「！？」や「。。。」のような連続は1つの区切りとし、閉じ括弧・引用符が続く場合は文の途中とみなして分割しない
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[。！？])(?![。！？」』）)"\'])\s*|(?<=[.!?])(?![.!?」』）)"\'])\s+')
+
+# 読み上げられる文字（記号・空白以外）
+_SPEAKABLE_RE = re.compile(r'\w')
+
+# 連続する空白（改行・全角空白を含む）
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# 文ごとの音声合成に共有するスレッドプール（呼び出しごとにスレッドを作成しない）
+# このプールのタスクから再びこのプールにタスクを投入して待つとデッドロックするため、
+# 文ごとの合成処理の中ではsynthesize_sentencesを呼ばないこと
+_sentence_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tts-sentence")
+
+# PCM形式のWAVヘッダー (RIFFヘッダー + fmtチャンク + dataチャンクヘッダー)
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+# WAVデータの解析に使用する構造 (RIFFヘッダー、チャンクヘッダー、fmtチャンクの内容)
+_RIFF_HEADER = struct.Struct("<4sI4s")
+_CHUNK_HEADER = struct.Struct("<4sI")
+_FMT_CHUNK = struct.Struct("<HHIIHH")
+_WAVE_FORMAT_PCM = 1
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    テキストを文末記号で文単位に分割する
+
+    Args:
+        text (str): 分割するテキスト
+
+    Returns:
+        List[str]: 空白を除去した文のリスト（空文字列や記号だけの文は含まない）
+    """
+    sentences: List[str] = []
+    pending = ""
+    for part in _SENTENCE_SPLIT_RE.split(text):
+        part = part.strip()
+        if not part:
+            continue
+        # 記号だけの断片は単独では読み上げられない（gTTSはエラーになる）ため、前後の文につなげる
+        if _SPEAKABLE_RE.search(part):
+            sentences.append(pending + part)
+            pending = ""
+        elif sentences:
+            sentences[-1] += part
+        else:
+            pending += part
+    return sentences
+
+
+def normalize_text(text: str) -> str:
+    """
+    読み上げに影響しない空白の違いをなくす
+
+    前後の空白を除去し、連続する空白を半角空白1つにまとめる。
+    空白だけが異なるテキストが同じキャッシュのキーになるように、合成前に適用する。
+
+    Args:
+        text (str): 正規化するテキスト
+
+    Returns:
+        str: 正規化したテキスト
+    """
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def synthesize_sentences(text: str, synthesize: Callable[[str], bytes]) -> List[bytes]:
+    """
+    複数の文からなるテキストを文ごとに並列で音声合成する
+
+    文ごとに合成することで、文単位でキャッシュが効き、各文の合成待ちが重なる。
+    1文だけのテキストはそのまま呼び出し元のスレッドで合成する。
+    テキストはnormalize_textで正規化してから合成する。
+
+    Args:
+        text (str): 読み上げるテキスト
+        synthesize (Callable[[str], bytes]): 1つの文を音声合成する関数
+
+    Returns:
+        List[bytes]: 文の順序どおりの音声データのリスト
+    """
+    text = normalize_text(text)
+    sentences = split_sentences(text)
+    if len(sentences) <= 1:
+        return [synthesize(text)]
+    return list(_sentence_executor.map(synthesize, sentences))
+
+
+def iter_sentence_audio(text: str, synthesize: Callable[[str], bytes]) -> Iterator[bytes]:
+    """
+    テキストを文ごとに音声合成し、文の順に音声データを返す
+
+    呼び出し元が1つ目の文の音声を再生している間に次の文を合成するため、
+    2つ目以降の文の合成待ちが再生時間に隠れる。
+    テキストはnormalize_textで正規化してから分割する。
+
+    Args:
+        text (str): 読み上げるテキスト
+        synthesize (Callable[[str], bytes]): 1つの文を音声合成する関数
+
+    Yields:
+        bytes: 文ごとの音声データ
+    """
+    sentences = split_sentences(normalize_text(text))
+    if not sentences:
+        return
+
+    audio = synthesize(sentences[0])
+    for sentence in sentences[1:]:
+        ahead = _sentence_executor.submit(synthesize, sentence)
+        yield audio
+        audio = ahead.result()
+    yield audio
+
+
+def fade_edges(wav: bytes, duration: float = 0.002) -> bytes:
+    """
+    WAVデータの先頭と末尾に短いフェードイン・フェードアウトをかける
+
+    文ごとの音声を続けて再生する際に、つなぎ目でクリックノイズが出ないようにする。
+    16bit PCM以外のWAVデータはそのまま返す。
+
+    Args:
+        wav (bytes): WAV形式の音声データ
+        duration (float, optional): フェードの長さ（秒）。デフォルトは0.002。
+
+    Returns:
+        bytes: フェードをかけたWAV形式の音声データ
+    """
+    nchannels, sample_width, sample_rate, samples = parse_wav(wav)
+    if sample_width != 2:
+        return wav
+
+    pcm = array("h")
+    pcm.frombytes(samples)
+    if sys.byteorder == "big":
+        pcm.byteswap()
+    frames = len(pcm) // nchannels
+    length = min(int(sample_rate * duration), frames // 2)
+    for i in range(length):
+        gain = i / length
+        head = i * nchannels
+        tail = (frames - 1 - i) * nchannels
+        for ch in range(nchannels):
+            pcm[head + ch] = int(pcm[head + ch] * gain)
+            pcm[tail + ch] = int(pcm[tail + ch] * gain)
+    if sys.byteorder == "big":
+        pcm.byteswap()
+    return build_wav(pcm, nchannels, sample_width, sample_rate)
+
+
+def parse_wav(data: bytes) -> Tuple[int, int, int, memoryview]:
+    """
+    PCM形式のWAVデータを解析し、形式とPCMサンプルを取得する
+
+    PCMサンプルは元のデータをコピーせずにmemoryviewで参照する。
+
+    Args:
+        data (bytes): WAV形式の音声データ（bytes-likeオブジェクト）
+
+    Returns:
+        Tuple[int, int, int, memoryview]: チャンネル数・サンプル幅（バイト数）・サンプルレート・PCMサンプル
+
+    Raises:
+        ValueError: PCM形式のWAVデータでない場合
+    """
+    view = memoryview(data).cast("B")
+    if len(view) < _RIFF_HEADER.size:
+        raise ValueError("WAVデータではありません")
+    riff, _, wave_id = _RIFF_HEADER.unpack_from(view, 0)
+    if riff != b"RIFF" or wave_id != b"WAVE":
+        raise ValueError("WAVデータではありません")
+
+    fmt = None
+    offset = _RIFF_HEADER.size
+    while offset + _CHUNK_HEADER.size <= len(view):
+        chunk_id, size = _CHUNK_HEADER.unpack_from(view, offset)
+        offset += _CHUNK_HEADER.size
+        if chunk_id == b"fmt ":
+            fmt = _FMT_CHUNK.unpack_from(view, offset)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("WAVデータにfmtチャンクがありません")
+            audio_format, nchannels, sample_rate, _, _, bits_per_sample = fmt
+            if audio_format != _WAVE_FORMAT_PCM:
+                raise ValueError("PCM形式のWAVデータではありません")
+            return nchannels, bits_per_sample // 8, sample_rate, view[offset:offset + size]
+        # チャンクは2バイト境界に揃えられている
+        offset += size + (size & 1)
+    raise ValueError("WAVデータにdataチャンクがありません")
+
+
+def concat_wav(wavs: List[bytes]) -> bytes:
+    """
+    同じ形式の複数のWAVデータを一つに結合する
+
+    各WAVデータのPCMサンプルは結合結果を作成する際に一度だけコピーする。
+
+    Args:
+        wavs (List[bytes]): 結合するWAV形式の音声データのリスト
+
+    Returns:
+        bytes: 結合されたWAV形式の音声データ
+
+    Raises:
+        ValueError: WAVデータが空、PCM形式でない、またはチャンネル数・サンプル幅・サンプルレートが一致しない場合
+    """
+    if not wavs:
+        raise ValueError("結合するWAVデータがありません")
+    if len(wavs) == 1:
+        return wavs[0]
+
+    params = None
+    parts: List[memoryview] = []
+    for data in wavs:
+        nchannels, sample_width, sample_rate, samples = parse_wav(data)
+        current = (nchannels, sample_width, sample_rate)
+        if params is None:
+            params = current
+        elif current != params:
+            raise ValueError("WAVデータの形式が一致しません")
+        parts.append(samples)
+
+    header = _wav_header(sum(part.nbytes for part in parts), *params)
+    return b"".join([header, *parts])
+
+
+def _wav_header(data_size: int, nchannels: int, sample_width: int, sample_rate: int) -> bytes:
+    """
+    PCM形式のWAVヘッダーを作成する
+
+    Args:
+        data_size (int): PCMサンプルのバイト数
+        nchannels (int): チャンネル数
+        sample_width (int): サンプル幅（バイト数）
+        sample_rate (int): サンプルレート
+
+    Returns:
+        bytes: 44バイトのWAVヘッダー
+    """
+    block_align = nchannels * sample_width
+    return _WAV_HEADER.pack(
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, _WAVE_FORMAT_PCM, nchannels, sample_rate, sample_rate * block_align, block_align,
+        sample_width * 8,
+        b"data", data_size,
+    )
+
+
+def build_wav(samples: bytes, nchannels: int, sample_width: int, sample_rate: int) -> bytes:
+    """
+    PCMサンプルにWAVヘッダーを付けてWAV形式の音声データを作成する
+
+    Args:
+        samples (bytes): PCMサンプル（bytes-likeオブジェクト）
+        nchannels (int): チャンネル数
+        sample_width (int): サンプル幅（バイト数）
+        sample_rate (int): サンプルレート
+
+    Returns:
+        bytes: WAV形式の音声データ
+    """
+    header = _wav_header(memoryview(samples).nbytes, nchannels, sample_width, sample_rate)
+    return b"".join((header, samples))
+
+
+def resample_pcm16(samples: bytes, nchannels: int, src_rate: int, dst_rate: int) -> bytes:
+    """
+    16bit PCMサンプルのサンプルレートを変換する
+
+    Args:
+        samples (bytes): 16bit PCMサンプル（bytes-likeオブジェクト）
+        nchannels (int): チャンネル数
+        src_rate (int): 変換前のサンプルレート
+        dst_rate (int): 変換後のサンプルレート
+
+    Returns:
+        bytes: 変換後の16bit PCMサンプル
+    """
+    pcm = np.frombuffer(samples, dtype="<i2")
+    pcm = pcm[:len(pcm) - len(pcm) % nchannels].reshape(-1, nchannels)
+    if src_rate == dst_rate or len(pcm) == 0:
+        return pcm.tobytes()
+
+    if resample_poly is not None:
+        gcd = math.gcd(src_rate, dst_rate)
+        out = resample_poly(pcm, dst_rate // gcd, src_rate // gcd, axis=0)
+    else:
+        positions = np.arange(round(len(pcm) * dst_rate / src_rate)) * (src_rate / dst_rate)
+        source_positions = np.arange(len(pcm))
+        out = np.empty((len(positions), nchannels))
+        for ch in range(nchannels):
+            out[:, ch] = np.interp(positions, source_positions, pcm[:, ch])
+    np.clip(out, -32768, 32767, out=out)
+    return out.astype("<i2").tobytes()
@@ -3,10 +3,98 @@
 VOICEVOX Engine APIのPythonラッパー
 """
 
+import time
+import asyncio
+import inspect
+import functools
+import threading
 import requests
-from typing import List, Dict, Union, Any, Optional, BinaryIO
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, List, Dict, Set, Tuple, Union, Any, Optional, BinaryIO
 from enum import Enum
 
+from audio_cache import DiskCache
+from tts_utils import concat_wav
+
+# JSONのエンコード・デコードには高速なorjsonを使用し、なければujson、標準のjsonの順に使用する
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def _dumps_sorted(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+
+    _loads = orjson.loads
+except ImportError:
+    try:
+        import ujson as json
+    except ImportError:
+        import json
+
+    # orjsonと同じく区切り文字の後の空白を省き、送信するリクエストボディを小さくする
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _dumps_sorted(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+    _loads = json.loads
+
+# JSONのリクエストボディを送信する際のヘッダー
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# synthesize_batchで共有するスレッドプール（呼び出しごとにスレッドを作成しない）
+_batch_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="voicevox-batch")
+
+# クライアントが使用するエンドポイントのパス（URLを初期化時に作成しておく）
+_ENDPOINTS = (
+    "/audio_query",
+    "/audio_query_from_preset",
+    "/accent_phrases",
+    "/mora_data",
+    "/mora_length",
+    "/mora_pitch",
+    "/synthesis",
+    "/cancellable_synthesis",
+    "/multi_synthesis",
+    "/sing_frame_audio_query",
+    "/sing_frame_f0",
+    "/sing_frame_volume",
+    "/frame_synthesis",
+    "/morphable_targets",
+    "/synthesis_morphing",
+    "/connect_waves",
+    "/validate_kana",
+    "/initialize_speaker",
+    "/is_initialized_speaker",
+    "/supported_devices",
+    "/presets",
+    "/add_preset",
+    "/update_preset",
+    "/delete_preset",
+    "/speakers",
+    "/speaker_info",
+    "/singers",
+    "/singer_info",
+    "/user_dict",
+    "/user_dict_word",
+    "/import_user_dict",
+    "/version",
+    "/core_versions",
+    "/engine_manifest",
+    "/setting",
+)
+
+# キャラクターの追加情報をキャッシュする秒数
+_INFO_CACHE_TTL = 300.0
+
+# ディスクキャッシュのキーに含めるエンジンのバージョンを問い合わせ直すまでの秒数
+# （アプリを起動したままエンジンを更新した場合にも、古い合成結果を返し続けないため）
+_VERSION_CACHE_TTL = 60.0
+
 
 class WordTypes(str, Enum):
     """品詞の列挙型"""
@@ -22,21 +110,201 @@ class CorsPolicyMode(str, Enum):
     ALL = "all"
     LOCALAPPS = "localapps"
 
+def _check(response: requests.Response) -> None:
+    """
+    レスポンスがエラーの場合に例外を送出する
+
+    成功時はステータスコードの比較だけで済ませ、エラー時のみraise_for_statusで
+    requestsと同じ内容のHTTPErrorを送出する。
+
+    Args:
+        response (requests.Response): レスポンス
+
+    Raises:
+        requests.HTTPError: ステータスコードが400以上の場合
+    """
+    if response.status_code >= 400:
+        response.raise_for_status()
+
+
+# 音声データをファイルに書き込む際の読み込み単位
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _write_chunks(response: requests.Response, output_file: BinaryIO) -> None:
+    """
+    レスポンスの本文全体をメモリに保持せずに、受信した順にファイルに書き込む
+
+    Args:
+        response (requests.Response): stream=Trueで送信したリクエストのレスポンス
+        output_file (BinaryIO): 出力ファイル
+    """
+    for chunk in response.iter_content(chunk_size=_STREAM_CHUNK_SIZE):
+        output_file.write(chunk)
+
 
 class VOICEVOXClient:
     """
     VOICEVOX Engine APIのクライアント
     """
 
-    def __init__(self, host: str = "localhost", port: int = 50021):
+    def __init__(self, host: str = "localhost", port: int = 50021, cache_dir: Optional[str] = None):
         """
         VOICEVOXクライアントの初期化
 
         Args:
             host (str, optional): ホスト名. Defaults to "localhost".
             port (int, optional): ポート番号. Defaults to 50021.
+            cache_dir (Optional[str], optional):
+                合成した音声を保存するディレクトリ。指定した場合、同じ内容の合成はエンジンに要求せずファイルから返す。
+                Defaults to None.
         """
         self.base_url = f"http://{host}:{port}"
+        # エンドポイントのURL（呼び出しごとに文字列を連結しない）
+        self._urls: Dict[str, str] = {path: self.base_url + path for path in _ENDPOINTS}
+        self._url_user_dict_word_prefix = self.base_url + "/user_dict_word/"
+        self._disk_cache: Optional[DiskCache] = DiskCache(cache_dir, ".bin") if cache_dir else None
+        # 接続を使い回すためのセッション（リクエストごとにTCP接続を張り直さない）
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=0)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        # エンジンの起動中は変わらない読み取り系APIの結果のキャッシュ
+        # キー: (エンドポイントのパス, パラメータ)  値: (結果, 有効期限 (Noneの場合は無期限))
+        self._read_cache: Dict[Any, Any] = {}
+        self._read_cache_lock = threading.Lock()
+        # 初期化済みと分かっているスタイルの (スピーカーID, コアバージョン)
+        # エンジンを再起動するまでは初期化済みのままのため、再度問い合わせない
+        self._initialized_speakers: Set[Tuple[int, Optional[str]]] = set()
+
+    def close(self) -> None:
+        """セッションを閉じて、保持している接続を解放する"""
+        self._session.close()
+
+    def __enter__(self) -> "VOICEVOXClient":
+        """with文の開始時にクライアント自身を返す"""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """with文の終了時にセッションを閉じる"""
+        self.close()
+
+    def invalidate_cache(self, path: Optional[str] = None) -> None:
+        """
+        読み取り系APIの結果のキャッシュを消去する
+
+        エンジンを再起動した場合など、キャラクターの一覧などが変わった可能性がある場合に呼び出す。
+
+        Args:
+            path (Optional[str], optional): 消去するエンドポイントのパス (例: "/speakers")。Noneの場合はすべて消去する。
+        """
+        with self._read_cache_lock:
+            if path is None:
+                self._read_cache.clear()
+            else:
+                for key in [key for key in self._read_cache if key[0] == path]:
+                    del self._read_cache[key]
+
+    def reset_initialization_cache(self) -> None:
+        """
+        初期化済みのスタイルの記録を消去する
+
+        エンジンを再起動した場合など、スタイルの初期化状態が変わった可能性がある場合に呼び出す。
+        """
+        self._initialized_speakers.clear()
+
+    def _get_cached(self, path: str, params: Optional[Dict[str, Any]] = None, ttl: Optional[float] = None) -> Any:
+        """
+        読み取り系APIの結果をキャッシュから取得し、なければリクエストしてキャッシュする
+
+        エラーになったリクエストの結果はキャッシュしない。
+        キャッシュした結果は呼び出し元と共有されるため、変更しないこと。
+
+        Args:
+            path (str): エンドポイントのパス
+            params (Optional[Dict[str, Any]], optional): クエリパラメータ. Defaults to None.
+            ttl (Optional[float], optional): キャッシュの有効秒数。Noneの場合は無期限。
+
+        Returns:
+            Any: レスポンスのJSONをデコードした値
+        """
+        key = (path, tuple(sorted(params.items())) if params else ())
+        with self._read_cache_lock:
+            entry = self._read_cache.get(key)
+        if entry is not None and (entry[1] is None or time.monotonic() < entry[1]):
+            return entry[0]
+
+        response = self._session.get(self._urls[path], params=params)
+        _check(response)
+        value = _loads(response.content)
+        expires = time.monotonic() + ttl if ttl is not None else None
+        with self._read_cache_lock:
+            self._read_cache[key] = (value, expires)
+        return value
+
+    def _post_audio(
+        self, path: str, params: Dict[str, Any], body: Any, output_file: Optional[BinaryIO]
+    ) -> Union[bytes, None]:
+        """
+        音声を返すエンドポイントにリクエストし、結果を返すか出力ファイルに書き込む
+
+        ディスクキャッシュが有効な場合は、エンジンのバージョン・エンドポイント・パラメータ・リクエストボディが
+        同じ合成結果をキャッシュから返し、エンジンへのリクエストを省略する。
+        エンジンを更新した後は、以前のバージョンで合成した結果を返さない。
+
+        Args:
+            path (str): エンドポイントのパス
+            params (Dict[str, Any]): クエリパラメータ
+            body (Any): JSONで送信するリクエストボディ
+            output_file (Optional[BinaryIO]): 出力ファイル
+
+        Returns:
+            Union[bytes, None]: 音声データ(output_fileがNoneの場合)
+        """
+        audio: Optional[bytes] = None
+        key: Optional[str] = None
+        if self._disk_cache is not None:
+            # キーの順序が異なるだけのクエリが同じキャッシュになるように、キーを並べ替えて送信する
+            data = _dumps_sorted(body)
+            engine_version = self._get_cached("/version", ttl=_VERSION_CACHE_TTL)
+            key = DiskCache.make_key(engine_version, path, repr(sorted(params.items())), data.decode("utf-8"))
+            audio = self._disk_cache.get(key)
+        else:
+            data = _dumps(body)
+
+        if audio is None:
+            with self._session.post(
+                self._urls[path],
+                params=params,
+                data=data,
+                headers=_JSON_HEADERS,
+                stream=True
+            ) as response:
+                _check(response)
+                if output_file is not None and key is None:
+                    _write_chunks(response, output_file)
+                    return None
+                audio = response.content
+            if key is not None:
+                self._disk_cache.put(key, audio)
+
+        if output_file is not None:
+            output_file.write(audio)
+            return None
+        return audio
+
+    @staticmethod
+    def _params(**kwargs: Any) -> Dict[str, Any]:
+        """
+        値がNoneの引数を除いてクエリパラメータを作成する
+
+        Args:
+            **kwargs (Any): パラメータ名と値
+
+        Returns:
+            Dict[str, Any]: クエリパラメータ
+        """
+        return {key: value for key, value in kwargs.items() if value is not None}
 
     # クエリ作成関連のAPI
 
@@ -53,16 +321,11 @@ class VOICEVOXClient:
         Returns:
             Dict[str, Any]: 音声合成用のクエリ
         """
-        params: Dict[str, Union[str, int]] = {
-            "text": text,
-            "speaker": speaker
-        }
-        if core_version is not None:
-            params["core_version"] = core_version
+        params = self._params(text=text, speaker=speaker, core_version=core_version)
 
-        response = requests.post(f"{self.base_url}/audio_query", params=params)
-        response.raise_for_status()
-        query = response.json()
+        response = self._session.post(self._urls["/audio_query"], params=params)
+        _check(response)
+        query = _loads(response.content)
         query["speedScale"] = speed
         return query
 
@@ -80,17 +343,12 @@ class VOICEVOXClient:
         Returns:
             Dict[str, Any]: 音声合成用のクエリ
         """
-        params: Dict[str, Union[str, int]] = {
-            "text": text,
-            "preset_id": preset_id
-        }
-        if core_version is not None:
-            params["core_version"] = core_version
+        params = self._params(text=text, preset_id=preset_id, core_version=core_version)
 
-        response = requests.post(
-            f"{self.base_url}/audio_query_from_preset", params=params)
-        response.raise_for_status()
-        return response.json()
+        response = self._session.post(
+            self._urls["/audio_query_from_preset"], params=params)
+        _check(response)
+        return _loads(response.content)
 
     def accent_phrases(
         self, text: str, speaker: int, is_kana: bool = False, core_version: Optional[str] = None
@@ -107,18 +365,12 @@ class VOICEVOXClient:
         Returns:
             List[Dict[str, Any]]: アクセント句のリスト
         """
-        params: Dict[str, Union[str, int, bool]] = {
-            "text": text,
-            "speaker": speaker,
-            "is_kana": is_kana
-        }
-        if core_version is not None:
-            params["core_version"] = core_version
+        params = self._params(text=text, speaker=speaker, is_kana=is_kana, core_version=core_version)
 
-        response = requests.post(
-            f"{self.base_url}/accent_phrases", params=params)
-        response.raise_for_status()
-        return response.json()
+        response = self._session.post(
+            self._urls["/accent_phrases"], params=params)
+        _check(response)
+        return _loads(response.content)
 
     def mora_data(
         self, accent_phrases: List[Dict[str, Any]], speaker: int, core_version: Optional[str] = None
@@ -134,19 +386,16 @@ class VOICEVOXClient:
         Returns:
             List[Dict[str, Any]]: 更新されたアクセント句のリスト
         """
-        params: Dict[str, Union[str, int]] = {
-            "speaker": speaker
-        }
-        if core_version is not None:
-            params["core_version"] = core_version
+        params = self._params(speaker=speaker, core_version=core_version)
 
-        response = requests.post(
-            f"{self.base_url}/mora_data",
+        response = self._session.post(
+            self._urls["/mora_data"],
             params=params,
-            json=accent_phrases
+            data=_dumps(accent_phrases),
+            headers=_JSON_HEADERS
         )
-        response.raise_for_status()
-        return response.json()
+        _check(response)
+        return _loads(response.content)
 
     def mora_length(
         self, accent_phrases: List[Dict[str, Any]], speaker: int, core_version: Optional[str] = None
@@ -154,6 +403,8 @@ class VOICEVOXClient:
         """
         アクセント句から音素長を得る
 
+        音高も必要な場合は、mora_pitchと続けて呼び出さずにmora_dataを1回呼び出すこと。
+
         Args:
             accent_phrases (List[Dict[str, Any]]): アクセント句のリスト
             speaker (int): スピーカーID
@@ -162,19 +413,16 @@ class VOICEVOXClient:
         Returns:
             List[Dict[str, Any]]: 更新されたアクセント句のリスト
         """
-        params: Dict[str, Union[str, int]] = {
-            "speaker": speaker
-        }
-        if core_version is not None:
-            params["core_version"] = core_version
+        params = self._params(speaker=speaker, core_version=core_version)
 
-        response = requests.post(
-            f"{self.base_url}/mora_length",
+        response = self._session.post(
+            self._urls["/mora_length"],
             params=params,
-            json=accent_phrases
+            data=_dumps(accent_phrases),
+            headers=_JSON_HEADERS
         )
-        response.raise_for_status()
-        return response.json()
+        _check(response)
+        return _loads(response.content)
 
     def mora_pitch(
         self, accent_phrases: List[Dict[str, Any]], speaker: int, core_version: Optional[str] = None
@@ -182,6 +430,8 @@ class VOICEVOXClient:
         """
         アクセント句から音高を得る
 
+        音素長も必要な場合は、mora_lengthと続けて呼び出さずにmora_dataを1回呼び出すこと。
+
         Args:
             accent_phrases (List[Dict[str, Any]]): アクセント句のリスト
             speaker (int): スピーカーID
@@ -190,19 +440,47 @@ class VOICEVOXClient:
         Returns:
             List[Dict[str, Any]]: 更新されたアクセント句のリスト
         """
-        params: Dict[str, Union[str, int]] = {
-            "speaker": speaker
-        }
-        if core_version is not None:
-            params["core_version"] = core_version
+        params = self._params(speaker=speaker, core_version=core_version)
 
-        response = requests.post(
-            f"{self.base_url}/mora_pitch",
+        response = self._session.post(
+            self._urls["/mora_pitch"],
             params=params,
-            json=accent_phrases
+            data=_dumps(accent_phrases),
+            headers=_JSON_HEADERS
         )
-        response.raise_for_status()
-        return response.json()
+        _check(response)
+        return _loads(response.content)
+
+    def compute_mora(
+        self,
+        accent_phrases: List[Dict[str, Any]],
+        speaker: int,
+        core_version: Optional[str] = None,
+        need_length: bool = True,
+        need_pitch: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        アクセント句の音素長・音高のうち必要なものを1回のリクエストで得る
+
+        両方が必要な場合はmora_dataを、片方だけの場合はmora_lengthまたはmora_pitchを呼び出す。
+
+        Args:
+            accent_phrases (List[Dict[str, Any]]): アクセント句のリスト
+            speaker (int): スピーカーID
+            core_version (Optional[str], optional): コアバージョン. Defaults to None.
+            need_length (bool, optional): 音素長を更新するか. Defaults to True.
+            need_pitch (bool, optional): 音高を更新するか. Defaults to True.
+
+        Returns:
+            List[Dict[str, Any]]: 更新されたアクセント句のリスト（どちらも不要な場合は引数のまま）
+        """
+        if need_length and need_pitch:
+            return self.mora_data(accent_phrases, speaker, core_version)
+        if need_length:
+            return self.mora_length(accent_phrases, speaker, core_version)
+        if need_pitch:
+            return self.mora_pitch(accent_phrases, speaker, core_version)
+        return accent_phrases
 
     # 音声合成関連のAPI
 
@@ -227,24 +505,11 @@ class VOICEVOXClient:
         Returns:
             Union[bytes, None]: 音声データ(output_fileがNoneの場合)
         """
-        params: Dict[str, Union[str, int, bool]] = {
-            "speaker": speaker,
-            "enable_interrogative_upspeak": enable_interrogative_upspeak
-        }
-        if core_version is not None:
-            params["core_version"] = core_version
-
-        response = requests.post(
-            f"{self.base_url}/synthesis",
-            params=params,
-            json=audio_query
+        params = self._params(
+            speaker=speaker, enable_interrogative_upspeak=enable_interrogative_upspeak, core_version=core_version
         )
-        response.raise_for_status()
 
-        if output_file is not None:
-            output_file.write(response.content)
-            return None
-        return response.content
+        return self._post_audio("/synthesis", params, audio_query, output_file)
 
     def cancellable_synthesis(
         self,
@@ -265,23 +530,9 @@ class VOICEVOXClient:
         Returns:
             Union[bytes, None]: 音声データ(output_fileがNoneの場合)
         """
-        params: Dict[str, Union[str, int]] = {
-            "speaker": speaker
-        }
-        if core_version is not None:
-            params["core_version"] = core_version
-
-        response = requests.post(
-            f"{self.base_url}/cancellable_synthesis",
-            params=params,
-            json=audio_query
-        )
-        response.raise_for_status()
+        params = self._params(speaker=speaker, core_version=core_version)
 
-        if output_file is not None:
-            output_file.write(response.content)
-            return None
-        return response.content
+        return self._post_audio("/cancellable_synthesis", params, audio_query, output_file)
 
     def multi_synthesis(
         self,
@@ -302,23 +553,30 @@ class VOICEVOXClient:
         Returns:
             Union[bytes, None]: 音声データ(output_fileがNoneの場合)
         """
-        params: Dict[str, Union[str, int]] = {
-            "speaker": speaker
-        }
-        if core_version is not None:
-            params["core_version"] = core_version
+        params = self._params(speaker=speaker, core_version=core_version)
 
-        response = requests.post(
-            f"{self.base_url}/multi_synthesis",
-            params=params,
-            json=audio_queries
-        )
-        response.raise_for_status()
+        return self._post_audio("/multi_synthesis", params, audio_queries, output_file)
 
-        if output_file is not None:
-            output_file.write(response.content)
-            return None
-        return response.content
+    def synthesize_batch(self, texts: List[str], speaker: int) -> List[bytes]:
+        """
+        複数のテキストを並列に音声合成する
+
+        テキストごとのクエリ作成と音声合成を共有のスレッドプールで最大4つまで同時に要求する。
+        各スレッドはクライアントのセッションの接続を共有する。
+
+        Args:
+            texts (List[str]): 合成するテキストのリスト
+            speaker (int): スピーカーID
+
+        Returns:
+            List[bytes]: テキストの順序どおりの音声データ(WAV形式)のリスト
+        """
+        def synthesize(text: str) -> bytes:
+            return self.synthesis(self.audio_query(text, speaker), speaker)
+
+        if len(texts) <= 1:
+            return [synthesize(text) for text in texts]
+        return list(_batch_executor.map(synthesize, texts))
 
     # 歌唱合成関連のAPI
 
@@ -336,19 +594,16 @@ class VOICEVOXClient:
         Returns:
             Dict[str, Any]: 歌唱音声合成用のクエリ
         """
-        params: Dict[str, Union[str, int]] = {
-            "speaker": speaker
-        }
-        if core_version is not None:
-            params["core_version"] = core_version
+        params = self._params(speaker=speaker, core_version=core_version)
 
-        response = requests.post(
-            f"{self.base_url}/sing_frame_audio_query",
+        response = self._session.post(
+            self._urls["/sing_frame_audio_query"],
             params=params,
-            json=score
+            data=_dumps(score),
+            headers=_JSON_HEADERS
         )
-        response.raise_for_status()
-        return response.json()
+        _check(response)
+        return _loads(response.content)
 
     def sing_frame_f0(
         self, score: Dict[str, Any], frame_audio_query: Dict[str, Any], speaker: int, core_version: Optional[str] = None
@@ -365,24 +620,21 @@ class VOICEVOXClient:
         Returns:
             List[float]: フレームごとの基本周波数
         """
-        params: Dict[str, Union[str, int]] = {
-            "speaker": speaker
-        }
-        if core_version is not None:
-            params["core_version"] = core_version
+        params = self._params(speaker=speaker, core_version=core_version)
 
         request_data = {
             "score": score,
             "frame_audio_query": frame_audio_query
         }
 
-        response = requests.post(
-            f"{self.base_url}/sing_frame_f0",
+        response = self._session.post(
+            self._urls["/sing_frame_f0"],
             params=params,
-            json=request_data
+            data=_dumps(request_data),
+            headers=_JSON_HEADERS
         )
-        response.raise_for_status()
-        return response.json()
+        _check(response)
+        return _loads(response.content)
 
     def sing_frame_volume(
         self, score: Dict[str, Any], frame_audio_query: Dict[str, Any], speaker: int, core_version: Optional[str] = None
@@ -399,24 +651,21 @@ class VOICEVOXClient:
         Returns:
             List[float]: フレームごとの音量
         """
-        params: Dict[str, Union[str, int]] = {
-            "speaker": speaker
-        }
-        if core_version is not None:
-            params["core_version"] = core_version
+        params = self._params(speaker=speaker, core_version=core_version)
 
         request_data = {
             "score": score,
             "frame_audio_query": frame_audio_query
         }
 
-        response = requests.post(
-            f"{self.base_url}/sing_frame_volume",
+        response = self._session.post(
+            self._urls["/sing_frame_volume"],
             params=params,
-            json=request_data
+            data=_dumps(request_data),
+            headers=_JSON_HEADERS
         )
-        response.raise_for_status()
-        return response.json()
+        _check(response)
+        return _loads(response.content)
 
     def frame_synthesis(
         self,
@@ -437,23 +686,9 @@ class VOICEVOXClient:
         Returns:
             Union[bytes, None]: 音声データ(output_fileがNoneの場合)
         """
-        params: Dict[str, Union[str, int]] = {
-            "speaker": speaker
-        }
-        if core_version is not None:
-            params["core_version"] = core_version
-
-        response = requests.post(
-            f"{self.base_url}/frame_synthesis",
-            params=params,
-            json=frame_audio_query
-        )
-        response.raise_for_status()
+        params = self._params(speaker=speaker, core_version=core_version)
 
-        if output_file is not None:
-            output_file.write(response.content)
-            return None
-        return response.content
+        return self._post_audio("/frame_synthesis", params, frame_audio_query, output_file)
 
     # モーフィング関連のAPI
 
@@ -470,17 +705,16 @@ class VOICEVOXClient:
         Returns:
             List[Dict[str, Any]]: モーフィング可能かどうかの情報
         """
-        params: Dict[str, str] = {}
-        if core_version is not None:
-            params["core_version"] = core_version
+        params = self._params(core_version=core_version)
 
-        response = requests.post(
-            f"{self.base_url}/morphable_targets",
+        response = self._session.post(
+            self._urls["/morphable_targets"],
             params=params,
-            json=base_style_ids
+            data=_dumps(base_style_ids),
+            headers=_JSON_HEADERS
         )
-        response.raise_for_status()
-        return response.json()
+        _check(response)
+        return _loads(response.content)
 
     def synthesis_morphing(
         self,
@@ -508,25 +742,11 @@ class VOICEVOXClient:
         if not 0.0 <= morph_rate <= 1.0:
             raise ValueError("morph_rate must be between 0.0 and 1.0")
 
-        params: Dict[str, Union[str, int, float]] = {
-            "base_speaker": base_speaker,
-            "target_speaker": target_speaker,
-            "morph_rate": morph_rate
-        }
-        if core_version is not None:
-            params["core_version"] = core_version
-
-        response = requests.post(
-            f"{self.base_url}/synthesis_morphing",
-            params=params,
-            json=audio_query
+        params = self._params(
+            base_speaker=base_speaker, target_speaker=target_speaker, morph_rate=morph_rate, core_version=core_version
         )
-        response.raise_for_status()
 
-        if output_file is not None:
-            output_file.write(response.content)
-            return None
-        return response.content
+        return self._post_audio("/synthesis_morphing", params, audio_query, output_file)
 
     # その他のユーティリティAPI
 
@@ -534,6 +754,8 @@ class VOICEVOXClient:
         """
         base64エンコードされた複数のwavデータを一つに結合する
 
+        結合するwavデータが同じ形式の場合は、connect_waves_localでリクエストせずに結合できる。
+
         Args:
             waves (List[str]): base64エンコードされたwavデータのリスト
             output_file (Optional[BinaryIO], optional): 出力ファイル. Defaults to None.
@@ -541,16 +763,38 @@ class VOICEVOXClient:
         Returns:
             Union[bytes, None]: 音声データ(output_fileがNoneの場合)
         """
-        response = requests.post(
-            f"{self.base_url}/connect_waves",
-            json=waves
-        )
-        response.raise_for_status()
+        with self._session.post(
+            self._urls["/connect_waves"],
+            data=_dumps(waves),
+            headers=_JSON_HEADERS,
+            stream=True
+        ) as response:
+            _check(response)
 
-        if output_file is not None:
-            output_file.write(response.content)
-            return None
-        return response.content
+            if output_file is not None:
+                _write_chunks(response, output_file)
+                return None
+            return response.content
+
+    @staticmethod
+    def connect_waves_local(waves: List[bytes]) -> bytes:
+        """
+        複数のwavデータをエンジンに送信せずに一つに結合する
+
+        connect_wavesと異なり、base64エンコードやHTTPリクエストを行わない。
+        すべてのwavデータが同じ形式（チャンネル数・サンプル幅・サンプルレート）のPCMの場合は、
+        connect_wavesの代わりにこちらを使用すること。
+
+        Args:
+            waves (List[bytes]): wavデータのリスト
+
+        Returns:
+            bytes: 結合された音声データ
+
+        Raises:
+            ValueError: wavデータが空、PCM形式でない、または形式が一致しない場合
+        """
+        return concat_wav(waves)
 
     def validate_kana(self, text: str) -> bool:
         """
@@ -562,13 +806,11 @@ class VOICEVOXClient:
         Returns:
             bool: 判定結果
         """
-        params = {
-            "text": text
-        }
-        response = requests.post(
-            f"{self.base_url}/validate_kana", params=params)
-        response.raise_for_status()
-        return response.json()
+        response = self._session.post(
+            self._urls["/validate_kana"], params={"text": text})
+        _check(response)
+        # 本文はJSONのtrue/falseだけなので、パースせずに比較する
+        return response.content == b"true"
 
     def initialize_speaker(
         self, speaker: int, skip_reinit: bool = False, core_version: Optional[str] = None
@@ -581,16 +823,12 @@ class VOICEVOXClient:
             skip_reinit (bool, optional): 既に初期化済みのスタイルの再初期化をスキップするか. Defaults to False.
             core_version (Optional[str], optional): コアバージョン. Defaults to None.
         """
-        params: Dict[str, Union[str, int, bool]] = {
-            "speaker": speaker,
-            "skip_reinit": skip_reinit
-        }
-        if core_version is not None:
-            params["core_version"] = core_version
+        params = self._params(speaker=speaker, skip_reinit=skip_reinit, core_version=core_version)
 
-        response = requests.post(
-            f"{self.base_url}/initialize_speaker", params=params)
-        response.raise_for_status()
+        response = self._session.post(
+            self._urls["/initialize_speaker"], params=params)
+        _check(response)
+        self._initialized_speakers.add((speaker, core_version))
 
     def is_initialized_speaker(self, speaker: int, core_version: Optional[str] = None) -> bool:
         """
@@ -603,16 +841,20 @@ class VOICEVOXClient:
         Returns:
             bool: 初期化済みかどうか
         """
-        params: Dict[str, Union[str, int]] = {
-            "speaker": speaker
-        }
-        if core_version is not None:
-            params["core_version"] = core_version
+        key = (speaker, core_version)
+        if key in self._initialized_speakers:
+            return True
 
-        response = requests.get(
-            f"{self.base_url}/is_initialized_speaker", params=params)
-        response.raise_for_status()
-        return response.json()
+        params = self._params(speaker=speaker, core_version=core_version)
+
+        response = self._session.get(
+            self._urls["/is_initialized_speaker"], params=params)
+        _check(response)
+        # 本文はJSONのtrue/falseだけなので、パースせずに比較する
+        initialized = response.content == b"true"
+        if initialized:
+            self._initialized_speakers.add(key)
+        return initialized
 
     def supported_devices(self, core_version: Optional[str] = None) -> Dict:
         """
@@ -624,14 +866,9 @@ class VOICEVOXClient:
         Returns:
             Dict[str, Any]: 対応デバイスの情報
         """
-        params: Dict[str, str] = {}
-        if core_version is not None:
-            params["core_version"] = core_version
+        params = self._params(core_version=core_version)
 
-        response = requests.get(
-            f"{self.base_url}/supported_devices", params=params)
-        response.raise_for_status()
-        return response.json()
+        return self._get_cached("/supported_devices", params)
 
     # プリセット関連のAPI
 
@@ -642,9 +879,7 @@ class VOICEVOXClient:
         Returns:
             List[Dict[str, Any]]: プリセットのリスト
         """
-        response = requests.get(f"{self.base_url}/presets")
-        response.raise_for_status()
-        return response.json()
+        return self._get_cached("/presets")
 
     def add_preset(self, preset: Dict[str, Any]) -> int:
         """
@@ -656,9 +891,11 @@ class VOICEVOXClient:
         Returns:
             int: 追加したプリセットのプリセットID
         """
-        response = requests.post(f"{self.base_url}/add_preset", json=preset)
-        response.raise_for_status()
-        return response.json()
+        response = self._session.post(self._urls["/add_preset"], data=_dumps(preset), headers=_JSON_HEADERS)
+        _check(response)
+        self.invalidate_cache("/presets")
+        # 本文はJSONの整数だけなので、パースせずに変換する
+        return int(response.content)
 
     def update_preset(self, preset: Dict[str, Any]) -> int:
         """
@@ -670,9 +907,11 @@ class VOICEVOXClient:
         Returns:
             int: 更新したプリセットのプリセットID
         """
-        response = requests.post(f"{self.base_url}/update_preset", json=preset)
-        response.raise_for_status()
-        return response.json()
+        response = self._session.post(self._urls["/update_preset"], data=_dumps(preset), headers=_JSON_HEADERS)
+        _check(response)
+        self.invalidate_cache("/presets")
+        # 本文はJSONの整数だけなので、パースせずに変換する
+        return int(response.content)
 
     def delete_preset(self, preset_id: int) -> None:
         """
@@ -681,12 +920,10 @@ class VOICEVOXClient:
         Args:
             preset_id (int): 削除するプリセットのプリセットID
         """
-        params = {
-            "id": preset_id
-        }
-        response = requests.post(
-            f"{self.base_url}/delete_preset", params=params)
-        response.raise_for_status()
+        response = self._session.post(
+            self._urls["/delete_preset"], params={"id": preset_id})
+        _check(response)
+        self.invalidate_cache("/presets")
 
     # スピーカー情報関連のAPI
 
@@ -700,13 +937,9 @@ class VOICEVOXClient:
         Returns:
             List[Dict[str, Any]]: キャラクター情報のリスト
         """
-        params: Dict[str, str] = {}
-        if core_version is not None:
-            params["core_version"] = core_version
+        params = self._params(core_version=core_version)
 
-        response = requests.get(f"{self.base_url}/speakers", params=params)
-        response.raise_for_status()
-        return response.json()
+        return self._get_cached("/speakers", params)
 
     def speaker_info(
         self, speaker_uuid: str, resource_format: str = "base64", core_version: Optional[str] = None
@@ -722,16 +955,9 @@ class VOICEVOXClient:
         Returns:
             Dict[str, Any]: キャラクターの追加情報
         """
-        params: Dict[str, str] = {
-            "speaker_uuid": speaker_uuid,
-            "resource_format": resource_format
-        }
-        if core_version is not None:
-            params["core_version"] = core_version
+        params = self._params(speaker_uuid=speaker_uuid, resource_format=resource_format, core_version=core_version)
 
-        response = requests.get(f"{self.base_url}/speaker_info", params=params)
-        response.raise_for_status()
-        return response.json()
+        return self._get_cached("/speaker_info", params, ttl=_INFO_CACHE_TTL)
 
     def singers(self, core_version: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -743,13 +969,9 @@ class VOICEVOXClient:
         Returns:
             List[Dict[str, Any]]: キャラクター情報のリスト
         """
-        params: Dict[str, str] = {}
-        if core_version is not None:
-            params["core_version"] = core_version
+        params = self._params(core_version=core_version)
 
-        response = requests.get(f"{self.base_url}/singers", params=params)
-        response.raise_for_status()
-        return response.json()
+        return self._get_cached("/singers", params)
 
     def singer_info(
         self, speaker_uuid: str, resource_format: str = "base64", core_version: Optional[str] = None
@@ -765,16 +987,9 @@ class VOICEVOXClient:
         Returns:
             Dict[str, Any]: キャラクターの追加情報
         """
-        params: Dict[str, str] = {
-            "speaker_uuid": speaker_uuid,
-            "resource_format": resource_format
-        }
-        if core_version is not None:
-            params["core_version"] = core_version
+        params = self._params(speaker_uuid=speaker_uuid, resource_format=resource_format, core_version=core_version)
 
-        response = requests.get(f"{self.base_url}/singer_info", params=params)
-        response.raise_for_status()
-        return response.json()
+        return self._get_cached("/singer_info", params, ttl=_INFO_CACHE_TTL)
 
     # ユーザー辞書関連のAPI
 
@@ -785,9 +1000,9 @@ class VOICEVOXClient:
         Returns:
             Dict[str, Any]: 単語のUUIDとその詳細
         """
-        response = requests.get(f"{self.base_url}/user_dict")
-        response.raise_for_status()
-        return response.json()
+        response = self._session.get(self._urls["/user_dict"])
+        _check(response)
+        return _loads(response.content)
 
     def add_user_dict_word(
         self,
@@ -810,22 +1025,18 @@ class VOICEVOXClient:
         Returns:
             str: 追加された言葉のUUID
         """
-        params: Dict[str, Union[str, int]] = {
-            "surface": surface,
-            "pronunciation": pronunciation,
-            "accent_type": accent_type
-        }
-        if word_type is not None:
-            params["word_type"] = word_type.value
-        if priority is not None:
-            if not 0 <= priority <= 10:
-                raise ValueError("priority must be between 0 and 10")
-            params["priority"] = priority
-
-        response = requests.post(
-            f"{self.base_url}/user_dict_word", params=params)
-        response.raise_for_status()
-        return response.json()
+        if priority is not None and not 0 <= priority <= 10:
+            raise ValueError("priority must be between 0 and 10")
+        params = self._params(
+            surface=surface, pronunciation=pronunciation, accent_type=accent_type,
+            word_type=word_type, priority=priority
+        )
+
+        response = self._session.post(
+            self._urls["/user_dict_word"], params=params)
+        _check(response)
+        # 本文はJSON文字列のUUIDだけなので、前後の引用符を除いて返す
+        return response.content[1:-1].decode("ascii")
 
     def rewrite_user_dict_word(
         self,
@@ -847,21 +1058,16 @@ class VOICEVOXClient:
             word_type (Optional[WordTypes], optional): 品詞. Defaults to None.
             priority (Optional[int], optional): 単語の優先度（0から10までの整数）. Defaults to None.
         """
-        params: Dict[str, Union[str, int]] = {
-            "surface": surface,
-            "pronunciation": pronunciation,
-            "accent_type": accent_type
-        }
-        if word_type is not None:
-            params["word_type"] = word_type.value
-        if priority is not None:
-            if not 0 <= priority <= 10:
-                raise ValueError("priority must be between 0 and 10")
-            params["priority"] = priority
-
-        response = requests.put(
-            f"{self.base_url}/user_dict_word/{word_uuid}", params=params)
-        response.raise_for_status()
+        if priority is not None and not 0 <= priority <= 10:
+            raise ValueError("priority must be between 0 and 10")
+        params = self._params(
+            surface=surface, pronunciation=pronunciation, accent_type=accent_type,
+            word_type=word_type, priority=priority
+        )
+
+        response = self._session.put(
+            self._url_user_dict_word_prefix + word_uuid, params=params)
+        _check(response)
 
     def delete_user_dict_word(self, word_uuid: str) -> None:
         """
@@ -870,9 +1076,9 @@ class VOICEVOXClient:
         Args:
             word_uuid (str): 削除する言葉のUUID
         """
-        response = requests.delete(
-            f"{self.base_url}/user_dict_word/{word_uuid}")
-        response.raise_for_status()
+        response = self._session.delete(
+            self._url_user_dict_word_prefix + word_uuid)
+        _check(response)
 
     def import_user_dict_words(self, import_dict_data: Dict[str, Any], override: bool = False) -> None:
         """
@@ -882,15 +1088,13 @@ class VOICEVOXClient:
             import_dict_data (Dict[str, Any]): インポートするユーザー辞書のデータ
             override (bool, optional): 重複したエントリがあった場合、上書きするかどうか. Defaults to False.
         """
-        params: Dict[str, bool] = {
-            "override": override
-        }
-        response = requests.post(
-            f"{self.base_url}/import_user_dict",
-            params=params,
-            json=import_dict_data
+        response = self._session.post(
+            self._urls["/import_user_dict"],
+            params={"override": override},
+            data=_dumps(import_dict_data),
+            headers=_JSON_HEADERS
         )
-        response.raise_for_status()
+        _check(response)
 
     # バージョン情報関連のAPI
 
@@ -901,9 +1105,7 @@ class VOICEVOXClient:
         Returns:
             str: バージョン
         """
-        response = requests.get(f"{self.base_url}/version")
-        response.raise_for_status()
-        return response.json()
+        return self._get_cached("/version")
 
     def core_versions(self) -> List[str]:
         """
@@ -912,9 +1114,7 @@ class VOICEVOXClient:
         Returns:
             List[str]: コアバージョンのリスト
         """
-        response = requests.get(f"{self.base_url}/core_versions")
-        response.raise_for_status()
-        return response.json()
+        return self._get_cached("/core_versions")
 
     def engine_manifest(self) -> Dict[str, Any]:
         """
@@ -923,9 +1123,7 @@ class VOICEVOXClient:
         Returns:
             Dict[str, Any]: エンジンマニフェスト
         """
-        response = requests.get(f"{self.base_url}/engine_manifest")
-        response.raise_for_status()
-        return response.json()
+        return self._get_cached("/engine_manifest")
 
     # 設定関連のAPI
 
@@ -938,16 +1136,94 @@ class VOICEVOXClient:
             allow_origin (Optional[str], optional): 許可するオリジン. Defaults to None.
         """
         data: Dict[str, str] = {
-            "cors_policy_mode": cors_policy_mode.value
+            "cors_policy_mode": cors_policy_mode
         }
         if allow_origin is not None:
             data["allow_origin"] = allow_origin
 
-        response = requests.post(
-            f"{self.base_url}/setting",
+        response = self._session.post(
+            self._urls["/setting"],
             data=data
         )
-        response.raise_for_status()
+        _check(response)
+
+
+class AsyncVOICEVOXClient:
+    """
+    VOICEVOX Engine APIの非同期クライアント
+
+    VOICEVOXClientの各メソッドを同じ引数のコルーチン関数として提供する。
+    リクエストはクライアント専用のスレッドプールで実行するため、
+    複数のテキストの合成などを並行して要求できる。
+    通信を行わない静的メソッド (connect_waves_local など) は提供しないため、VOICEVOXClientから直接呼び出すこと。
+
+    例:
+        async with AsyncVOICEVOXClient() as client:
+            queries = await asyncio.gather(*(client.audio_query(t, 1) for t in texts))
+    """
+
+    def __init__(
+        self, host: str = "localhost", port: int = 50021, max_workers: int = 8, cache_dir: Optional[str] = None
+    ):
+        """
+        非同期VOICEVOXクライアントの初期化
+
+        Args:
+            host (str, optional): ホスト名. Defaults to "localhost".
+            port (int, optional): ポート番号. Defaults to 50021.
+            max_workers (int, optional): 同時に実行するリクエストの最大数. Defaults to 8.
+            cache_dir (Optional[str], optional): 合成した音声を保存するディレクトリ. Defaults to None.
+        """
+        self._client = VOICEVOXClient(host, port, cache_dir=cache_dir)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="voicevox")
+
+    @property
+    def base_url(self) -> str:
+        """VOICEVOX EngineのベースURL"""
+        return self._client.base_url
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        """
+        VOICEVOXClientのメソッドをコルーチン関数として取得する
+
+        Args:
+            name (str): メソッド名
+
+        Returns:
+            Callable[..., Awaitable[Any]]: 同じ引数で呼び出せるコルーチン関数
+
+        Raises:
+            AttributeError: VOICEVOXClientに公開メソッドがない場合、または静的メソッドの場合
+        """
+        if name.startswith("_"):
+            raise AttributeError(name)
+        # 静的メソッドは通信を行わないため、スレッドで実行するコルーチン関数にしない
+        raw = inspect.getattr_static(VOICEVOXClient, name, None)
+        if raw is None or isinstance(raw, staticmethod) or not callable(raw):
+            raise AttributeError(name)
+        method = getattr(VOICEVOXClient, name)
+        bound = getattr(self._client, name)
+
+        @functools.wraps(method)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(bound, *args, **kwargs))
+
+        return call
+
+    async def close(self) -> None:
+        """実行中のリクエストの完了を待ち、スレッドプールとセッションを閉じる"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+        self._client.close()
+
+    async def __aenter__(self) -> "AsyncVOICEVOXClient":
+        """async with文の開始時にクライアント自身を返す"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        """async with文の終了時にクライアントを閉じる"""
+        await self.close()
 
 
 # 簡易使用例
@@ -5,14 +5,23 @@
 VOICEVOX Engine APIで生成した音声を特定のスピーカーデバイスで再生するモジュール
 """
 
-from audio_player import AudioPlayer
+import hashlib
+from audio_player import AudioPlayer, BaseSpeaker
+from audio_cache import AudioCache
 from voicevox import VOICEVOXClient
-from typing import Dict, Any, List, Union
+from tts_utils import synthesize_sentences, concat_wav, iter_sentence_audio, fade_edges
+from typing import Dict, Any, Iterator, List, Union
 
+# 合成済みの文ごとのWAVデータを (テキストのハッシュ値, キャラクターID, 話速) をキーに保持する
+# 取得時の並べ替えを避けるため、保存順に破棄する
+_audio_cache = AudioCache(maxsize=256, policy="fifo", max_bytes=64 * 1024 * 1024)
 
-class VoicevoxSpeaker:
+
+class VoicevoxSpeaker(BaseSpeaker):
     """VOICEVOXの音声を特定のスピーカーデバイスで再生するクラス"""
 
+    __slots__ = ("client",)
+
     def __init__(self, player: AudioPlayer, client: VOICEVOXClient):
         """
         VoicevoxSpeakerの初期化
@@ -21,9 +30,14 @@ class VoicevoxSpeaker:
             player (AudioPlayer): オーディオ再生を処理するAudioPlayerインスタンス
             client (VOICEVOXClient): VOICEVOX APIと通信するためのクライアント
         """
-        self.player = player
+        super().__init__(player)
         self.client = client
 
+    @staticmethod
+    def cache_clear() -> None:
+        """合成済みWAVデータのメモリ上のキャッシュを消去する"""
+        _audio_cache.clear()
+
     def get_audio_data(self, text: str, speaker_id: int, speed: float = 1.0) -> bytes | None:
         """
         指定されたテキストをVOICEVOXで音声合成してWAVデータを返す
@@ -36,9 +50,52 @@ class VoicevoxSpeaker:
         Returns:
             bytes | None: 音声データ(WAV形式)
         """
-        query = self.client.audio_query(text, speaker_id, speed=speed)
-        audio_data = self.client.synthesis(query, speaker_id)
-        return audio_data
+        # 複数の文からなるテキストは文ごとに並列で合成して連結する
+        parts = synthesize_sentences(text, lambda s: self._synthesize(s, speaker_id, speed))
+        return concat_wav(parts)
+
+    def iter_audio_data(self, text: str, speaker_id: int, speed: float = 1.0) -> Iterator[bytes]:
+        """
+        指定されたテキストを文ごとにVOICEVOXで音声合成し、文の順にWAVデータを返す
+
+        呼び出し元が文の音声を再生している間に次の文を合成する。
+        文のつなぎ目のクリックノイズを防ぐため、文ごとの音声の前後に短いフェードをかける。
+
+        Args:
+            text (str): 読み上げるテキスト
+            speaker_id (int): VOICEVOXのキャラクターID
+            speed (float, optional): 話速. Defaults to 1.0.
+
+        Yields:
+            bytes: 文ごとの音声データ(WAV形式)
+        """
+        for audio_data in iter_sentence_audio(text, lambda s: self._synthesize(s, speaker_id, speed)):
+            yield fade_edges(audio_data)
+
+    def _synthesize(self, text: str, speaker_id: int, speed: float) -> bytes:
+        """
+        1つのテキストをVOICEVOXで音声合成してWAVデータを返す
+
+        同じ(text, speaker_id, speed)の組み合わせは合成済みのWAVデータをメモリから返し、
+        同時に同じ組み合わせが要求された場合は一度だけ合成する。
+        ディスクへのキャッシュは、音声合成用のクエリをキーにVOICEVOXClientが行う。
+
+        Args:
+            text (str): 読み上げるテキスト
+            speaker_id (int): VOICEVOXのキャラクターID
+            speed (float): 話速
+
+        Returns:
+            bytes: 音声データ(WAV形式)
+        """
+        # 長いテキストをそのままキーとして保持しないように、ハッシュ値をキーに使う
+        text_hash = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+        def synthesize() -> bytes:
+            query = self.client.audio_query(text, speaker_id, speed=speed)
+            return self.client.synthesis(query, speaker_id)
+
+        return _audio_cache.get_or_compute((text_hash, speaker_id, speed), synthesize)
 
     def speak(self, text: str, speaker_id: int, wait: bool = True, speed: float = 1.0) -> None:
         """
@@ -54,19 +111,22 @@ class VoicevoxSpeaker:
         if audio_data:
             self.play_bytes(audio_data, wait=wait)
 
-    def play_bytes(self, audio_data: bytes, wait: bool = True) -> None:
+    def speak_streaming(self, text: str, speaker_id: int, speed: float = 1.0) -> None:
         """
-        WAV形式のバイトデータを再生する
+        指定されたテキストを文ごとに音声合成しながら再生する
+
+        文の音声を再生している間に次の文を合成するため、全体の合成を待たずに再生を始められる。
+        再生中に停止がリクエストされた場合は、残りの文を再生しない。
 
         Args:
-            audio_data (bytes): 再生するWAVデータ
-            wait (bool, optional): 再生が終了するまで待機するかどうか。デフォルトはTrue。
+            text (str): 読み上げるテキスト
+            speaker_id (int): VOICEVOXのキャラクターID
+            speed (float, optional): 話速. Defaults to 1.0.
         """
-        self.player.play_wav_bytes(audio_data, wait=wait)
-
-    def request_stop(self) -> None:
-        """再生の停止をリクエストする"""
-        self.player.request_stop()
+        for audio_data in self.iter_audio_data(text, speaker_id, speed=speed):
+            if self.player.stop_requested:
+                break
+            self.play_bytes(audio_data)
 
 
 # 使用例